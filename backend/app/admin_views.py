@@ -0,0 +1,37 @@
+import time
+from typing import Any, Hashable
+
+from app.cache import TTLCache
+from app.config import settings
+
+# Admin dashboard reads (pending count, assignment views) are polled on every refresh;
+# they are served from memory for up to settings.ADMIN_VIEW_CACHE_TTL seconds. The
+# views join users, tags, sessions and reviews, so every router that writes those
+# calls invalidate_admin_views() right after its db.commit().
+_admin_view_cache = TTLCache(maxsize=256)
+# Bumped on every invalidation so a read that started before a write cannot cache its
+# (by then stale) result after the write has cleared the cache
+_admin_view_generation = 0
+
+
+def get_admin_view(key: Hashable) -> Any:
+    """Return a cached admin view, or None."""
+    return _admin_view_cache.get(key)
+
+
+def admin_view_generation() -> int:
+    """Generation to pass to cache_admin_view(); read it before querying the view."""
+    return _admin_view_generation
+
+
+def cache_admin_view(key: Hashable, value: Any, generation: int) -> None:
+    """Cache a view computed at `generation`, unless a write has invalidated it since."""
+    if generation == _admin_view_generation:
+        _admin_view_cache.set(key, value, time.time() + settings.ADMIN_VIEW_CACHE_TTL)
+
+
+def invalidate_admin_views() -> None:
+    """Drop cached admin views; write handlers call this right after db.commit()."""
+    global _admin_view_generation
+    _admin_view_generation += 1
+    _admin_view_cache.clear()
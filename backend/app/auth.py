@@ -1,10 +1,22 @@
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+import jwt
+from jwt import InvalidTokenError as JWTError
 import bcrypt
-from fastapi import Depends, HTTPException, status
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from app.cache import TTLCache
 from app.config import settings
 from app.database import get_db
 from app.models import User, UserRole
@@ -12,13 +24,119 @@ from app.schemas import TokenData
 
 security = HTTPBearer()
 
+# Token settings are fixed for the process lifetime; bind them once for the hot path
+_SECRET = settings.SECRET_KEY
+_ALG = settings.ALGORITHM
+_ALGS = [_ALG]
+_EXP_MIN = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+REVIEWER_ROLES = frozenset({UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value})
 
+# New hashes use Argon2id; bcrypt hashes from before the switch are still accepted
+# and upgraded on the next successful login
+_argon2 = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+_ARGON2_PREFIX = b'$argon2'
+_BCRYPT_HASH_LEN = 60
+_BCRYPT_PREFIXES = (b'$2a$', b'$2b$', b'$2y$')
 
-def get_password_hash(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# Password hashing is CPU-bound; it runs here so async handlers don't block the event loop
+_hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="passwd-hash")
+
+# Decoded tokens keyed by the raw token string; entries expire with the token
+_token_cache = TTLCache(maxsize=4096)
+
+# Recent successful checks keyed by an HMAC of (stored hash, password) under a
+# per-process key, so repeat logins skip Argon2. Only matches are cached, and a
+# password change alters the stored hash, which invalidates the entry.
+_verified_cache = TTLCache(maxsize=1024)
+_verified_cache_key = secrets.token_bytes(32)
+
+# User ids recently confirmed as active admins, so admin-only mutations can skip
+# loading the user. Role, status and deletion changes drop the entry via forget_user_access.
+_admin_cache = TTLCache(maxsize=1024)
+
+# Current role of recently seen active users, for download links authorized by ?token=
+_user_role_cache = TTLCache(maxsize=10_000)
+
+# Verified against when there is no real hash (unknown email, OAuth-only account)
+_DUMMY_HASH = _argon2.hash("confeval-dummy-password")
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: Optional[Union[str, bytes]]
+) -> Tuple[bool, Optional[bytes]]:
+    """Check a password and return (matches, new_hash).
+
+    new_hash is set when the password matched but the stored hash is legacy
+    bcrypt or uses outdated Argon2 parameters; callers should persist it.
+    """
+    if not hashed_password:
+        _burn_verify(plain_password)
+        return False, None
+    if not isinstance(hashed_password, bytes):
+        hashed_password = hashed_password.encode('utf-8')
+
+    if hashed_password.startswith(_ARGON2_PREFIX):
+        cache_key = hmac.new(
+            _verified_cache_key, hashed_password + b'\0' + plain_password.encode('utf-8'), hashlib.sha256
+        ).digest()
+        if _verified_cache.get(cache_key):
+            return True, None
+        try:
+            _argon2.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False, None
+        if _argon2.check_needs_rehash(hashed_password):
+            return True, get_password_hash(plain_password)
+        if settings.PASSWORD_CHECK_CACHE_TTL > 0:
+            _verified_cache.set(cache_key, True, time.time() + settings.PASSWORD_CHECK_CACHE_TTL)
+        return True, None
+
+    # A malformed stored hash can never match; reject it without running bcrypt
+    if len(hashed_password) != _BCRYPT_HASH_LEN or not hashed_password.startswith(_BCRYPT_PREFIXES):
+        _burn_verify(plain_password)
+        return False, None
+    # checkpw compares the digests in constant time
+    if bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password):
+        return True, get_password_hash(plain_password)
+    return False, None
+
+
+def _burn_verify(plain_password: str) -> None:
+    """Spend the same work as a real check, so a missing hash can't be told apart by timing."""
+    try:
+        _argon2.verify(_DUMMY_HASH, plain_password)
+    except VerificationError:
+        pass
+
+
+def verify_password(plain_password: str, hashed_password: Optional[Union[str, bytes]]) -> bool:
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+
+def get_password_hash(password: str) -> bytes:
+    return _argon2.hash(password).encode('ascii')
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: Optional[Union[str, bytes]]
+) -> Tuple[bool, Optional[bytes]]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, verify_and_update_password, plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: Optional[Union[str, bytes]]) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> bytes:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, get_password_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -26,21 +144,30 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     # Convert sub to string for JWT standard compliance
     if "sub" in to_encode:
         to_encode["sub"] = str(to_encode["sub"])
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    # exp is a NumericDate (epoch seconds); integer math avoids datetime round-trips
+    lifetime = expires_delta.total_seconds() if expires_delta is not None else _EXP_MIN * 60
+    to_encode["exp"] = int(time.time() + lifetime)
+    return jwt.encode(to_encode, _SECRET, algorithm=_ALG)
 
 
 def decode_token(token: str) -> Optional[TokenData]:
+    cached = _token_cache.get(token)
+    if cached is not None:
+        return cached
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _SECRET, algorithms=_ALGS)
         user_id_str = payload.get("sub")
         role: str = payload.get("role")
         if user_id_str is None:
             return None
-        return TokenData(user_id=int(user_id_str), role=role)
+        token_data = TokenData(user_id=int(user_id_str), role=role)
     except (JWTError, ValueError):
         return None
+    # Only tokens with an expiry are cached, so a hit never outlives the token
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _token_cache.set(token, token_data, float(exp))
+    return token_data
 
 
 async def get_current_user(
@@ -57,7 +184,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = db.get(User, token_data.user_id)
     
     if user is None:
         raise HTTPException(
@@ -75,12 +202,76 @@ async def get_current_user(
     return user
 
 
+def require_admin_token_param(token: Optional[str] = Query(None)) -> TokenData:
+    """Authorize a direct download link that carries an admin token as ?token=.
+
+    Uses the same bound key and decode cache as bearer-token auth.
+    """
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+    token_data = decode_token(token)
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+    if token_data.role != UserRole.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return token_data
+
+
+def require_user_token_param(token: str = Query(...), db: Session = Depends(get_db)) -> TokenData:
+    """Authorize a direct download link that carries the user's token as ?token=.
+
+    Returns the token's user id with the user's current role; the role is
+    cached for USER_ACCESS_CACHE_TTL so repeat downloads skip the user lookup.
+    """
+    token_data = decode_token(token)
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+    role = _user_role_cache.get(token_data.user_id)
+    if role is None:
+        row = db.query(User.role, User.is_active).filter(User.id == token_data.user_id).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        if not row.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Inactive user"
+            )
+        role = row.role
+        if settings.USER_ACCESS_CACHE_TTL > 0:
+            _user_role_cache.set(token_data.user_id, role, time.time() + settings.USER_ACCESS_CACHE_TTL)
+    return TokenData(user_id=token_data.user_id, role=role)
+
+
 def require_role(*roles: UserRole):
+    # Same roles in any order share one dependency, so FastAPI's per-request cache matches
+    return _role_checker(tuple(sorted({UserRole(r) for r in roles}, key=lambda r: r.value)))
+
+
+@lru_cache(maxsize=None)
+def _role_checker(roles: Tuple[UserRole, ...]):
+    allowed = frozenset(r.value for r in roles)
+    denied_detail = f"Access denied. Required roles: {[r.value for r in roles]}"
+
     async def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in [r.value for r in roles]:
+        if current_user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {[r.value for r in roles]}"
+                detail=denied_detail
             )
         return current_user
     return role_checker
@@ -95,8 +286,54 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
+def forget_user_access(user_id: int) -> None:
+    """Drop cached access checks after the user's role or status changes."""
+    _admin_cache.pop(user_id)
+    _user_role_cache.pop(user_id)
+
+
+def require_admin_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> TokenData:
+    """Like require_admin, for handlers that only need the caller's identity.
+
+    A recent successful check is reused instead of loading the user again.
+    """
+    token_data = decode_token(credentials.credentials)
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if _admin_cache.get(token_data.user_id):
+        return token_data
+    
+    row = db.query(User.role, User.is_active).filter(User.id == token_data.user_id).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not row.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    if row.role != UserRole.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    if settings.ADMIN_CHECK_CACHE_TTL > 0:
+        _admin_cache.set(token_data.user_id, True, time.time() + settings.ADMIN_CHECK_CACHE_TTL)
+    return token_data
+
+
 def require_reviewer(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role not in [UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]:
+    if current_user.role not in REVIEWER_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Reviewer access required"
@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire at a per-entry deadline.
+
+    Used for small, read-mostly lookups on the request hot path (decoded
+    tokens, site settings). Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
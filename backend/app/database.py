@@ -1,17 +1,40 @@
-from sqlalchemy import create_engine
+import sqlite3
+
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.config import settings
 
-# Configure connection args based on database type
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite leaves foreign keys unenforced by default; handlers rely on them like on PostgreSQL."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+# Configure connection and pool args based on database type
 connect_args = {}
+engine_kwargs = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args["check_same_thread"] = False
+    if settings.DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+        # In-memory databases only exist per connection, so share a single one
+        engine_kwargs["poolclass"] = StaticPool
+elif settings.DATABASE_URL.startswith("postgresql"):
+    engine_kwargs.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
 
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args=connect_args,
-    pool_pre_ping=True  # Verify connections before use
+    pool_pre_ping=True,  # Verify connections before use
+    **engine_kwargs
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
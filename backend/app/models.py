@@ -1,6 +1,7 @@
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean, 
-    ForeignKey, Float, Table
+    ForeignKey, Float, Table, TypeDecorator, UniqueConstraint, Enum, Index, text,
+    event, inspect, select, update
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -56,6 +57,42 @@ class TeamInvitationStatus(str, enum.Enum):
     DECLINED = "declined"
 
 
+class PasswordHash(TypeDecorator):
+    """Password hash (Argon2id; bcrypt for legacy rows) held as bytes in Python, stored as ASCII text in the DB"""
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, bytes):
+            return value.decode('ascii')
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.encode('ascii')
+
+
+class StringEnum(TypeDecorator):
+    """Native DB enum for a str-valued Enum; Python code keeps seeing the plain string values"""
+    impl = Enum
+    cache_ok = True
+
+    def __init__(self, enum_class, **kw):
+        self.enum_class = enum_class
+        super().__init__(
+            enum_class,
+            native_enum=True,
+            values_callable=lambda members: [m.value for m in members],
+            **kw
+        )
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value.value
+
+
 # Association tables
 project_tags = Table(
     'project_tags',
@@ -106,9 +143,9 @@ class User(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=True)  # Nullable for Google OAuth users
+    hashed_password = Column(PasswordHash(255), nullable=True)  # Nullable for Google OAuth users
     full_name = Column(String(255), nullable=False)
-    role = Column(String(50), default=UserRole.STUDENT)
+    role = Column(StringEnum(UserRole), default=UserRole.STUDENT)
     id_number = Column(String(9), nullable=True)  # 9-digit ID card number
     phone_number = Column(String(20), nullable=True)  # Optional phone number
     affiliation = Column(String(255), nullable=True)  # For external reviewers
@@ -118,6 +155,9 @@ class User(Base):
     is_approved = Column(Boolean, default=True)  # Reviewers need admin approval
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Serves role filters and the pending-reviewer-approval count
+    __table_args__ = (Index("ix_users_role_approved_active", "role", "is_approved", "is_active"),)
     
     # Relationships
     projects = relationship("Project", back_populates="student", cascade="all, delete-orphan")
@@ -157,7 +197,7 @@ class Conference(Base):
     room_number = Column(Integer, nullable=True)      # 101..109
 
     location = Column(String(255), nullable=True)
-    status = Column(String(50), default=ConferenceStatus.DRAFT)
+    status = Column(StringEnum(ConferenceStatus), default=ConferenceStatus.DRAFT, index=True)
     max_sessions = Column(Integer, default=10)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -172,11 +212,11 @@ class Session(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    conference_id = Column(Integer, ForeignKey("conferences.id", ondelete="SET NULL"), nullable=True)
+    conference_id = Column(Integer, ForeignKey("conferences.id", ondelete="SET NULL"), nullable=True, index=True)
     start_date = Column(DateTime(timezone=True), nullable=False)
     end_date = Column(DateTime(timezone=True), nullable=False)
     location = Column(String(255), nullable=True)
-    status = Column(String(50), default=SessionStatus.UPCOMING)
+    status = Column(StringEnum(SessionStatus), default=SessionStatus.UPCOMING)
     max_projects = Column(Integer, default=50)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -192,13 +232,18 @@ class Session(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_status_session", "status", "session_id"),
+        # Lets list_projects read newest-first pages in index order instead of sorting
+        Index("ix_projects_created_at", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False)
     description = Column(Text, nullable=True)
-    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=True)
-    status = Column(String(50), default=ProjectStatus.PENDING)
+    status = Column(StringEnum(ProjectStatus), default=ProjectStatus.PENDING)
     advisor_email = Column(String(255), nullable=True)
     supervisor1_email = Column(String(255), nullable=True)
     supervisor2_email = Column(String(255), nullable=True)
@@ -206,6 +251,9 @@ class Project(Base):
     slides_path = Column(String(500), nullable=True)
     additional_docs_path = Column(String(500), nullable=True)
     poster_number = Column(String(50), nullable=True)
+    # Completed-review tallies read by the reports; kept current by the Review events below
+    completed_reviews_count = Column(Integer, nullable=False, default=0, server_default="0")
+    avg_score = Column(Float, nullable=True)  # unscored completed reviews count as 0
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -221,6 +269,13 @@ class Project(Base):
 
 class Criteria(Base):
     __tablename__ = "criteria"
+    # Serves per-session listing in order and the next-order MAX lookup; the included id
+    # makes the reorder ID-check aggregate index-only on PostgreSQL
+    __table_args__ = (
+        Index("ix_criteria_session_order", "session_id", "order", postgresql_include=["id"]),
+    )
+    # Fetch server defaults (created_at) via INSERT ... RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
@@ -238,6 +293,16 @@ class Criteria(Base):
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_project_completed", "project_id", "is_completed"),
+        # Covers only the rows the score aggregates read; INCLUDE makes AVG index-only
+        Index(
+            "ix_reviews_completed_scored", "project_id",
+            postgresql_include=["total_score"],
+            postgresql_where=text("is_completed AND total_score IS NOT NULL"),
+            sqlite_where=text("is_completed AND total_score IS NOT NULL"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -269,11 +334,15 @@ class CriteriaScore(Base):
 
 class ReviewerApplication(Base):
     __tablename__ = "reviewer_applications"
+    # One application per reviewer per session; the unique index also serves duplicate lookups
+    __table_args__ = (
+        UniqueConstraint("reviewer_id", "session_id", name="uq_reviewer_session"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     reviewer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
-    status = Column(String(50), default=ApplicationStatus.PENDING)
+    status = Column(StringEnum(ApplicationStatus), default=ApplicationStatus.PENDING)
     message = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -312,11 +381,12 @@ class SiteSettings(Base):
 class ProjectTeamInvitation(Base):
     """Pending team invitations for unregistered users"""
     __tablename__ = "project_team_invitations"
+    __table_args__ = (Index("ix_project_team_invitations_email_status", "email", "status"),)
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     email = Column(String(255), nullable=False, index=True)
-    status = Column(String(50), default=TeamInvitationStatus.PENDING)
+    status = Column(StringEnum(TeamInvitationStatus), default=TeamInvitationStatus.PENDING)
     invited_by_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     responded_at = Column(DateTime(timezone=True), nullable=True)
@@ -324,3 +394,34 @@ class ProjectTeamInvitation(Base):
     # Relationships
     project = relationship("Project", back_populates="pending_invitations")
     invited_by = relationship("User")
+
+
+def _refresh_project_review_stats(connection, project_id: int) -> None:
+    """Recompute a project's completed_reviews_count and avg_score from its reviews."""
+    completed = (Review.project_id == project_id) & (Review.is_completed == True)  # noqa: E712
+    connection.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(
+            completed_reviews_count=select(func.count(Review.id)).where(completed).scalar_subquery(),
+            avg_score=select(func.avg(func.coalesce(Review.total_score, 0))).where(completed).scalar_subquery(),
+            # A review changing is not an edit of the project itself
+            updated_at=Project.updated_at,
+        )
+    )
+
+
+@event.listens_for(Review, "after_insert")
+@event.listens_for(Review, "after_delete")
+def _review_added_or_removed(mapper, connection, target):
+    if target.is_completed:
+        _refresh_project_review_stats(connection, target.project_id)
+
+
+@event.listens_for(Review, "after_update")
+def _review_updated(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.is_completed.history.has_changes() or (
+        target.is_completed and state.attrs.total_score.history.has_changes()
+    ):
+        _refresh_project_review_stats(connection, target.project_id)
@@ -1,19 +1,45 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, exists
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only
 from typing import List
 
 from app.database import get_db
 from app.models import (
-    ReviewerApplication, Session as SessionModel, User, UserRole, ApplicationStatus, NotificationType
+    ReviewerApplication, Session as SessionModel, User, UserRole, ApplicationStatus, NotificationType,
+    session_reviewers
 )
 from app.schemas import (
     ApplicationCreate, ApplicationStatusUpdate, ApplicationResponse, NotificationCreate
 )
-from app.auth import get_current_user, require_reviewer, require_admin
-from app.routers.notifications import create_notification
+from app.auth import get_current_user, require_reviewer, require_admin, REVIEWER_ROLES
+from app.routers.notifications import create_notification, create_notifications
 
 router = APIRouter(prefix="/applications", tags=["Reviewer Applications"])
 
+# Columns and relationships ApplicationResponse reads; avoids per-row lazy loads in list views
+_APPLICATION_LIST_OPTIONS = (
+    load_only(
+        ReviewerApplication.id,
+        ReviewerApplication.reviewer_id,
+        ReviewerApplication.session_id,
+        ReviewerApplication.status,
+        ReviewerApplication.message,
+        ReviewerApplication.created_at,
+    ),
+    joinedload(ReviewerApplication.reviewer),
+    joinedload(ReviewerApplication.session),
+)
+
+
+def _is_duplicate_application(error: IntegrityError) -> bool:
+    """Whether an INSERT failed on the (reviewer_id, session_id) unique constraint."""
+    # psycopg2 names the violated constraint; SQLite only reports the columns
+    diag = getattr(error.orig, "diag", None)
+    if diag is not None:
+        return diag.constraint_name == "uq_reviewer_session"
+    return "UNIQUE constraint failed: reviewer_applications.reviewer_id, reviewer_applications.session_id" in str(error.orig)
+
 
 @router.get("", response_model=List[ApplicationResponse])
 async def list_applications(
@@ -23,10 +49,10 @@ async def list_applications(
     db: Session = Depends(get_db)
 ):
     """List applications based on user role"""
-    query = db.query(ReviewerApplication)
+    query = db.query(ReviewerApplication).options(*_APPLICATION_LIST_OPTIONS)
     
     # Reviewers only see their own applications
-    if current_user.role in [UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]:
+    if current_user.role in REVIEWER_ROLES:
         query = query.filter(ReviewerApplication.reviewer_id == current_user.id)
     elif current_user.role != UserRole.ADMIN.value:
         raise HTTPException(
@@ -48,7 +74,7 @@ async def get_my_applications(
     db: Session = Depends(get_db)
 ):
     """Get current reviewer's applications"""
-    return db.query(ReviewerApplication).filter(
+    return db.query(ReviewerApplication).options(*_APPLICATION_LIST_OPTIONS).filter(
         ReviewerApplication.reviewer_id == current_user.id
     ).order_by(ReviewerApplication.created_at.desc()).all()
 
@@ -71,7 +97,7 @@ async def get_application(
         )
     
     # Check permissions
-    if current_user.role in [UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]:
+    if current_user.role in REVIEWER_ROLES:
         if application.reviewer_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -93,27 +119,24 @@ async def create_application(
     db: Session = Depends(get_db)
 ):
     """Apply to a session (reviewers only)"""
-    # Check session exists and is available
-    session = db.query(SessionModel).filter(SessionModel.id == application_data.session_id).first()
+    session_id = application_data.session_id
+    # Session lookup and already-assigned check in one round-trip
+    session = db.execute(
+        select(
+            SessionModel.name,
+            exists().where(
+                session_reviewers.c.session_id == session_id,
+                session_reviewers.c.user_id == current_user.id
+            ).label("assigned"),
+        ).where(SessionModel.id == session_id)
+    ).first()
     if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Session not found"
         )
     
-    # Check for existing application
-    existing = db.query(ReviewerApplication).filter(
-        ReviewerApplication.session_id == application_data.session_id,
-        ReviewerApplication.reviewer_id == current_user.id
-    ).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have already applied to this session"
-        )
-    
-    # Check if already assigned
-    if current_user in session.reviewers:
+    if session.assigned:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You are already assigned to this session"
@@ -125,21 +148,30 @@ async def create_application(
         message=application_data.message
     )
     
+    # Duplicates are caught by the (reviewer_id, session_id) unique constraint
     db.add(application)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if not _is_duplicate_application(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already applied to this session"
+        )
     db.refresh(application)
     
     # Notify all admins about the new application
-    admins = db.query(User).filter(User.role == UserRole.ADMIN.value).all()
-    for admin in admins:
-        notification = NotificationCreate(
-            user_id=admin.id,
-            type=NotificationType.GENERAL.value,
-            title="New Session Application",
-            message=f"{current_user.full_name} has applied to review session: {session.name}",
-            link="/admin/applications"
-        )
-        create_notification(db, notification)
+    admin_ids = db.query(User.id).filter(User.role == UserRole.ADMIN.value).all()
+    create_notifications(
+        db,
+        (admin_id for (admin_id,) in admin_ids),
+        type=NotificationType.GENERAL,
+        title="New Session Application",
+        message=f"{current_user.full_name} has applied to review session: {session.name}",
+        link="/admin/applications"
+    )
     
     return application
 
@@ -152,7 +184,9 @@ async def update_application_status(
     db: Session = Depends(get_db)
 ):
     """Update application status (admin only)"""
-    application = db.query(ReviewerApplication).filter(
+    application = db.query(ReviewerApplication).options(
+        joinedload(ReviewerApplication.session)
+    ).filter(
         ReviewerApplication.id == application_id
     ).first()
     
@@ -163,13 +197,18 @@ async def update_application_status(
         )
     
     application.status = status_update.status.value
+    session = application.session
     
     # If approved, add reviewer to session
     if status_update.status == ApplicationStatus.APPROVED:
-        session = db.query(SessionModel).filter(SessionModel.id == application.session_id).first()
-        reviewer = db.query(User).filter(User.id == application.reviewer_id).first()
-        if reviewer not in session.reviewers:
-            session.reviewers.append(reviewer)
+        already_assigned = db.query(session_reviewers).filter(
+            session_reviewers.c.session_id == session.id,
+            session_reviewers.c.user_id == application.reviewer_id
+        ).first()
+        if not already_assigned:
+            db.execute(session_reviewers.insert().values(
+                session_id=session.id, user_id=application.reviewer_id
+            ))
         
         # Send approval notification
         notification = NotificationCreate(
@@ -182,7 +221,6 @@ async def update_application_status(
         create_notification(db, notification)
     elif status_update.status == ApplicationStatus.REJECTED:
         # Send rejection notification
-        session = db.query(SessionModel).filter(SessionModel.id == application.session_id).first()
         notification = NotificationCreate(
             user_id=application.reviewer_id,
             type=NotificationType.APPLICATION_REJECTED,
@@ -216,7 +254,7 @@ async def delete_application(
         )
     
     # Check permissions
-    if current_user.role in [UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]:
+    if current_user.role in REVIEWER_ROLES:
         if application.reviewer_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
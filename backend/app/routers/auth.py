@@ -1,26 +1,97 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session, load_only, selectinload
+from typing import BinaryIO, List, Optional
 from pydantic import BaseModel
 import os
+import time
 import uuid
+from google.oauth2 import id_token
+from google.auth.transport import requests as google_requests
 
 from app.database import get_db
 from app.models import User, UserRole, Tag, SiteSettings, NotificationType
 from app.schemas import (
     UserResponse, UserUpdate, UserWithTags,
-    LoginRequest, Token, NotificationCreate
+    LoginRequest, Token, TokenData
 )
-from app.routers.notifications import create_notification
+from app.routers.notifications import create_notifications
 from app.auth import (
-    get_password_hash, verify_password, create_access_token,
-    get_current_user, require_admin
+    get_password_hash_async, verify_and_update_password_async,
+    create_access_token, get_current_user, require_admin, require_admin_token_param,
+    forget_user_access
 )
+from app.admin_views import invalidate_admin_views
+from app.cache import TTLCache
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+ALLOWED_CV_EXTENSIONS = frozenset({"pdf", "doc", "docx"})
+
+# Site settings change rarely; reads are served from memory for up to
+# settings.SETTINGS_CACHE_TTL seconds
+_settings_cache = TTLCache(maxsize=64)
+_MISSING = object()
+
+# Shared across Google sign-ins so certificate fetches reuse one pooled HTTP session
+_google_request = google_requests.Request()
+
+
+def _check_upload_size(upload: UploadFile) -> None:
+    """Reject an upload over MAX_FILE_SIZE before anything is written to disk."""
+    size = upload.size
+    if size is None:
+        size = upload.file.seek(0, os.SEEK_END)
+        upload.file.seek(0)
+    if size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size exceeds {settings.MAX_FILE_SIZE // (1024*1024)}MB limit"
+        )
+
+
+def _store_cv(src: BinaryIO, ext: str) -> str:
+    """Copy an upload to a new file in the cvs directory and return its path.
+
+    The cvs directory is publicly served under /uploads, so every CV gets a
+    random name: its URL cannot be derived from the file's content.
+    """
+    final_path = os.path.join(settings.UPLOAD_DIR, "cvs", f"{uuid.uuid4()}.{ext}")
+    try:
+        with open(final_path, "wb") as out:
+            while chunk := src.read(UPLOAD_CHUNK_SIZE):
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(final_path):
+            os.remove(final_path)
+        raise
+    return final_path
+
+
+async def _save_cv(upload: UploadFile) -> str:
+    """Validate a CV upload and store it; returns the stored file path."""
+    ext = os.path.splitext(upload.filename)[1].lstrip(".").lower()
+    if ext not in ALLOWED_CV_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CV must be PDF, DOC, or DOCX"
+        )
+    _check_upload_size(upload)
+    return await run_in_threadpool(_store_cv, upload.file, ext)
+
+
+def get_setting_cached(db: Session, key: str) -> Optional[str]:
+    """Return a site setting's value (None if unset), cached per key for settings.SETTINGS_CACHE_TTL."""
+    value = _settings_cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = db.query(SiteSettings.value).filter(SiteSettings.key == key).scalar()
+        _settings_cache.set(key, value, time.time() + settings.SETTINGS_CACHE_TTL)
+    return value
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -43,8 +114,8 @@ async def register(
         )
     
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == email).first()
-    if existing_user:
+    email_taken = db.query(exists().where(User.email == email)).scalar()
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -75,33 +146,7 @@ async def register(
     # Process CV if uploaded
     cv_path = None
     if cv:
-        # Validate file type
-        ext = cv.filename.split(".")[-1].lower()
-        if ext not in {"pdf", "doc", "docx"}:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="CV must be PDF, DOC, or DOCX"
-            )
-        
-        # Create upload directory
-        upload_dir = os.path.join(settings.UPLOAD_DIR, "cvs")
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Save file
-        filename = f"{uuid.uuid4()}.{ext}"
-        file_path = os.path.join(upload_dir, filename)
-        
-        content = await cv.read()
-        if len(content) > settings.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size exceeds {settings.MAX_FILE_SIZE // (1024*1024)}MB limit"
-            )
-        
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        cv_path = file_path
+        cv_path = await _save_cv(cv)
     
     # Reviewers need approval, students are auto-approved
     needs_approval = user_role in [UserRole.INTERNAL_REVIEWER, UserRole.EXTERNAL_REVIEWER]
@@ -109,17 +154,15 @@ async def register(
     # For internal reviewers, get default affiliation from settings
     user_affiliation = affiliation
     if user_role == UserRole.INTERNAL_REVIEWER:
-        default_affiliation = db.query(SiteSettings).filter(
-            SiteSettings.key == "internal_reviewer_affiliation"
-        ).first()
-        if default_affiliation:
-            user_affiliation = default_affiliation.value
+        default_affiliation = get_setting_cached(db, "internal_reviewer_affiliation")
+        if default_affiliation is not None:
+            user_affiliation = default_affiliation
     
     # Create user
     user = User(
         email=email,
         full_name=full_name,
-        hashed_password=get_password_hash(password),
+        hashed_password=await get_password_hash_async(password),
         role=user_role.value,
         affiliation=user_affiliation,
         id_number=id_number,
@@ -134,17 +177,16 @@ async def register(
     
     # Notify admins if a reviewer registered (needs approval)
     if needs_approval:
-        admins = db.query(User).filter(User.role == UserRole.ADMIN.value).all()
+        admin_ids = db.query(User.id).filter(User.role == UserRole.ADMIN.value).all()
         role_label = "Internal Reviewer" if user_role == UserRole.INTERNAL_REVIEWER else "External Reviewer"
-        for admin in admins:
-            notification = NotificationCreate(
-                user_id=admin.id,
-                type=NotificationType.GENERAL,
-                title="New Reviewer Registration",
-                message=f'{user.full_name} has registered as {role_label} and needs approval.',
-                link="/admin/users"
-            )
-            create_notification(db, notification)
+        create_notifications(
+            db,
+            (admin_id for (admin_id,) in admin_ids),
+            type=NotificationType.GENERAL,
+            title="New Reviewer Registration",
+            message=f'{user.full_name} has registered as {role_label} and needs approval.',
+            link="/admin/users"
+        )
     
     return user
 
@@ -154,13 +196,22 @@ async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     """Login and get access token"""
     user = db.query(User).filter(User.email == credentials.email).first()
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    # Always run a hash check so unknown emails take as long as wrong passwords
+    password_ok, new_hash = await verify_and_update_password_async(
+        credentials.password, user.hashed_password if user else None
+    )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade legacy bcrypt (or outdated Argon2) hashes now that we have the plaintext
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -183,13 +234,13 @@ async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserWithTags)
-async def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: User = Depends(get_current_user)):
     """Get current user profile"""
     return current_user
 
 
 @router.put("/me", response_model=UserResponse)
-async def update_me(
+def update_me(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -205,6 +256,7 @@ async def update_me(
         current_user.phone_number = user_update.phone_number
     
     db.commit()
+    invalidate_admin_views()
     db.refresh(current_user)
     
     return current_user
@@ -223,31 +275,7 @@ async def upload_cv(
             detail="Only reviewers can upload CVs"
         )
     
-    # Validate file type
-    ext = file.filename.split(".")[-1].lower()
-    if ext not in {"pdf", "doc", "docx"}:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PDF, DOC, DOCX files are allowed"
-        )
-    
-    # Create upload directory
-    upload_dir = os.path.join(settings.UPLOAD_DIR, "cvs")
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Save file
-    filename = f"{uuid.uuid4()}.{ext}"
-    file_path = os.path.join(upload_dir, filename)
-    
-    content = await file.read()
-    if len(content) > settings.MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size exceeds {settings.MAX_FILE_SIZE // (1024*1024)}MB limit"
-        )
-    
-    with open(file_path, "wb") as f:
-        f.write(content)
+    file_path = await _save_cv(file)
     
     # Update user
     current_user.cv_path = file_path
@@ -258,37 +286,12 @@ async def upload_cv(
 
 
 @router.get("/users/{user_id}/cv")
-async def download_cv(
+def download_cv(
     user_id: int,
-    token: str = None,
+    _: TokenData = Depends(require_admin_token_param),
     db: Session = Depends(get_db)
 ):
-    """Download user's CV (admin only)"""
-    from jose import JWTError, jwt
-    from app.config import settings
-    
-    # Verify token from query param (for direct download links)
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required"
-        )
-    
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id_from_token = payload.get("sub")
-        role = payload.get("role")
-        if user_id_from_token is None or role != "admin":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access required"
-            )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
-    
+    """Download user's CV (admin only, token passed as a query param for direct links)"""
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
@@ -302,25 +305,30 @@ async def download_cv(
             detail="User has no CV uploaded"
         )
     
-    if not os.path.exists(user.cv_path):
+    # One stat both checks existence and is handed to FileResponse, which
+    # would otherwise stat the file again before streaming it
+    try:
+        stat_result = os.stat(user.cv_path)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="CV file not found"
         )
     
     # Get file extension for proper filename
-    ext = user.cv_path.split(".")[-1]
+    ext = os.path.splitext(user.cv_path)[1].lstrip(".")
     filename = f"{user.full_name.replace(' ', '_')}_CV.{ext}"
     
     return FileResponse(
         path=user.cv_path,
         filename=filename,
-        media_type="application/octet-stream"
+        media_type="application/octet-stream",
+        stat_result=stat_result
     )
 
 
 @router.put("/me/tags", response_model=UserWithTags)
-async def update_interested_tags(
+def update_interested_tags(
     tag_ids: List[int],
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -342,6 +350,7 @@ async def update_interested_tags(
     
     current_user.interested_tags = tags
     db.commit()
+    invalidate_admin_views()
     db.refresh(current_user)
     
     return current_user
@@ -349,20 +358,29 @@ async def update_interested_tags(
 
 # Admin endpoints for user management
 @router.get("/users/pending-count")
-async def get_pending_approval_count(
+def get_pending_approval_count(
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Get count of users pending approval (admin only)"""
-    count = db.query(User).filter(
+    # Plain COUNT(*) over (role, is_approved) can be answered from ix_users_role_approved_active
+    count = db.query(func.count()).select_from(User).filter(
         User.role.in_([UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]),
         User.is_approved == False  # noqa: E712
-    ).count()
+    ).scalar()
     return {"pending_count": count}
 
 
+# Columns UserWithTags serializes; skips hashed_password and updated_at
+_USER_LIST_COLUMNS = load_only(
+    User.id, User.email, User.full_name, User.role, User.id_number, User.phone_number,
+    User.affiliation, User.is_active, User.is_approved, User.cv_path, User.google_id,
+    User.created_at,
+)
+
+
 @router.get("/users", response_model=List[UserWithTags])
-async def list_users(
+def list_users(
     role: str = None,
     skip: int = 0,
     limit: int = 100,
@@ -370,20 +388,20 @@ async def list_users(
     db: Session = Depends(get_db)
 ):
     """List all users (admin only)"""
-    query = db.query(User)
+    query = db.query(User).options(_USER_LIST_COLUMNS, selectinload(User.interested_tags))
     if role:
         query = query.filter(User.role == role)
     return query.offset(skip).limit(limit).all()
 
 
 @router.get("/users/{user_id}", response_model=UserWithTags)
-async def get_user(
+def get_user(
     user_id: int,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Get user by ID (admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(selectinload(User.interested_tags)).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -393,7 +411,7 @@ async def get_user(
 
 
 @router.put("/users/{user_id}/status")
-async def toggle_user_status(
+def toggle_user_status(
     user_id: int,
     is_active: bool,
     current_user: User = Depends(require_admin),
@@ -409,12 +427,14 @@ async def toggle_user_status(
     
     user.is_active = is_active
     db.commit()
+    invalidate_admin_views()
+    forget_user_access(user_id)
     
     return {"message": f"User {'activated' if is_active else 'deactivated'} successfully"}
 
 
 @router.put("/users/{user_id}/approve")
-async def approve_reviewer(
+def approve_reviewer(
     user_id: int,
     is_approved: bool,
     current_user: User = Depends(require_admin),
@@ -436,12 +456,13 @@ async def approve_reviewer(
     
     user.is_approved = is_approved
     db.commit()
+    invalidate_admin_views()
     
     return {"message": f"Reviewer {'approved' if is_approved else 'rejected'} successfully"}
 
 
 @router.put("/users/{user_id}/role")
-async def update_user_role(
+def update_user_role(
     user_id: int,
     role: str = Query(...),
     current_user: User = Depends(require_admin),
@@ -477,12 +498,14 @@ async def update_user_role(
         user.is_approved = True
     
     db.commit()
+    invalidate_admin_views()
+    forget_user_access(user_id)
     
     return {"message": f"User role updated to {role}"}
 
 
 @router.delete("/users/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -503,8 +526,10 @@ async def delete_user(
     
     if user.role == UserRole.ADMIN.value:
         # Check if there's at least one other admin
-        admin_count = db.query(User).filter(User.role == UserRole.ADMIN.value).count()
-        if admin_count <= 1:
+        other_admin = db.query(
+            exists().where(User.role == UserRole.ADMIN.value, User.id != user.id)
+        ).scalar()
+        if not other_admin:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete the last admin account"
@@ -512,6 +537,8 @@ async def delete_user(
     
     db.delete(user)
     db.commit()
+    invalidate_admin_views()
+    forget_user_access(user_id)
     
     return {"message": "User deleted successfully"}
 
@@ -523,19 +550,16 @@ class GoogleAuthRequest(BaseModel):
 
 
 @router.post("/google", response_model=Token)
-async def google_auth(
+def google_auth(
     auth_data: GoogleAuthRequest,
     db: Session = Depends(get_db)
 ):
     """Authenticate with Google OAuth"""
-    from google.oauth2 import id_token
-    from google.auth.transport import requests
-    
     try:
         # Verify the Google ID token
         idinfo = id_token.verify_oauth2_token(
             auth_data.token,
-            requests.Request(),
+            _google_request,
             settings.GOOGLE_CLIENT_ID
         )
         
@@ -575,14 +599,11 @@ async def google_auth(
             
             needs_approval = user_role in [UserRole.INTERNAL_REVIEWER, UserRole.EXTERNAL_REVIEWER]
             
-            # Generate a random password for OAuth users (they won't use it)
-            import secrets
-            random_password = secrets.token_urlsafe(32)
-            
+            # OAuth users have no password; a NULL hash never verifies at /login
             user = User(
                 email=email,
                 full_name=full_name,
-                hashed_password=get_password_hash(random_password),
+                hashed_password=None,
                 google_id=google_id,
                 role=user_role.value,
                 is_approved=not needs_approval
@@ -617,17 +638,16 @@ class SettingUpdate(BaseModel):
 
 
 @router.get("/settings/{key}")
-async def get_setting(
+def get_setting(
     key: str,
     db: Session = Depends(get_db)
 ):
     """Get a site setting value"""
-    setting = db.query(SiteSettings).filter(SiteSettings.key == key).first()
-    return {"key": key, "value": setting.value if setting else None}
+    return {"key": key, "value": get_setting_cached(db, key)}
 
 
 @router.put("/settings/{key}")
-async def update_setting(
+def update_setting(
     key: str,
     data: SettingUpdate,
     current_user: User = Depends(require_admin),
@@ -635,17 +655,20 @@ async def update_setting(
 ):
     """Update a site setting (admin only)"""
     setting = db.query(SiteSettings).filter(SiteSettings.key == key).first()
+    previous_value = setting.value if setting else None
     if setting:
         setting.value = data.value
     else:
         setting = SiteSettings(key=key, value=data.value)
         db.add(setting)
     
-    # If updating internal_reviewer_affiliation, update all internal reviewers
-    if key == "internal_reviewer_affiliation":
+    # If internal_reviewer_affiliation changed, update all internal reviewers in one UPDATE;
+    # no User objects are used afterwards, so the session needn't be synchronized
+    if key == "internal_reviewer_affiliation" and data.value != previous_value:
         db.query(User).filter(
             User.role == UserRole.INTERNAL_REVIEWER.value
-        ).update({"affiliation": data.value})
+        ).update({"affiliation": data.value}, synchronize_session=False)
     
     db.commit()
+    _settings_cache.pop(key)
     return {"key": key, "value": data.value}
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.orm import Session, aliased, load_only, selectinload
 from typing import List, Optional
 from datetime import datetime, timezone
 
@@ -13,6 +14,12 @@ from app.auth import get_current_user, require_admin
 
 router = APIRouter(prefix="/conferences", tags=["Conferences"])
 
+# Columns ConferenceResponse serializes; skips the timestamps
+_CONFERENCE_LIST_COLUMNS = load_only(
+    Conference.id, Conference.name, Conference.description, Conference.start_date,
+    Conference.end_date, Conference.building, Conference.floor, Conference.room_number,
+    Conference.location, Conference.status, Conference.max_sessions,
+)
 
 def _to_aware(dt):
     """Normalize datetime to timezone-aware UTC."""
@@ -73,10 +80,11 @@ def fill_location_if_missing(obj) -> Optional[str]:
 # Public
 # ---------------------------
 @router.get("/public", response_model=List[ConferenceResponse])
-async def list_public_conferences(db: Session = Depends(get_db)):
+def list_public_conferences(db: Session = Depends(get_db)):
     """List active conferences - public endpoint (no auth required)"""
     return (
         db.query(Conference)
+        .options(_CONFERENCE_LIST_COLUMNS)
         .filter(Conference.status == ConferenceStatus.ACTIVE.value)
         .order_by(Conference.start_date.desc())
         .all()
@@ -87,7 +95,7 @@ async def list_public_conferences(db: Session = Depends(get_db)):
 # Admin/Users list
 # ---------------------------
 @router.get("", response_model=List[ConferenceResponse])
-async def list_conferences(
+def list_conferences(
     status: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
@@ -95,7 +103,7 @@ async def list_conferences(
     db: Session = Depends(get_db),
 ):
     """List all conferences"""
-    query = db.query(Conference)
+    query = db.query(Conference).options(_CONFERENCE_LIST_COLUMNS)
 
     # Non-admin users can only see active conferences
     if current_user.role != UserRole.ADMIN.value:
@@ -111,7 +119,7 @@ async def list_conferences(
 # Get conference details (with sessions)
 # ---------------------------
 @router.get("/{conference_id}", response_model=ConferenceWithSessions)
-async def get_conference(
+def get_conference(
     conference_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -132,6 +140,7 @@ async def get_conference(
     if current_user.role != UserRole.ADMIN.value and conference.status != ConferenceStatus.ACTIVE.value:
         raise HTTPException(status_code=404, detail="Conference not found")
 
+    # sessions are already loaded for the response, so counting them is free
     conference.session_count = len(conference.sessions or [])
     return conference
 
@@ -140,7 +149,7 @@ async def get_conference(
 # Create conference
 # ---------------------------
 @router.post("", response_model=ConferenceResponse, status_code=status.HTTP_201_CREATED)
-async def create_conference(
+def create_conference(
     conference_data: ConferenceCreate,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
@@ -185,7 +194,7 @@ async def create_conference(
 # Update conference
 # ---------------------------
 @router.put("/{conference_id}", response_model=ConferenceResponse)
-async def update_conference(
+def update_conference(
     conference_id: int,
     conference_data: ConferenceUpdate,
     current_user: User = Depends(require_admin),
@@ -193,12 +202,7 @@ async def update_conference(
 ):
     """Update a conference (admin only)"""
 
-    conference = (
-        db.query(Conference)
-        .options(selectinload(Conference.sessions))
-        .filter(Conference.id == conference_id)
-        .first()
-    )
+    conference = db.get(Conference, conference_id)
     if not conference:
         raise HTTPException(status_code=404, detail="Conference not found")
 
@@ -235,7 +239,11 @@ async def update_conference(
 
     # Check max_sessions against current session count
     if "max_sessions" in update_data:
-        current_session_count = len(conference.sessions or [])
+        current_session_count = (
+            db.query(func.count(SessionModel.id))
+            .filter(SessionModel.conference_id == conference_id)
+            .scalar()
+        )
         if update_data["max_sessions"] < current_session_count:
             raise HTTPException(
                 status_code=400,
@@ -276,24 +284,22 @@ async def update_conference(
 # Delete conference
 # ---------------------------
 @router.delete("/{conference_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_conference(
+def delete_conference(
     conference_id: int,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Delete a conference (admin only)"""
 
-    conference = (
-        db.query(Conference)
-        .options(selectinload(Conference.sessions))
-        .filter(Conference.id == conference_id)
-        .first()
-    )
+    conference = db.get(Conference, conference_id)
     if not conference:
         raise HTTPException(status_code=404, detail="Conference not found")
 
     # Check if conference has sessions
-    if conference.sessions:
+    has_sessions = db.query(
+        exists().where(SessionModel.conference_id == conference_id)
+    ).scalar()
+    if has_sessions:
         raise HTTPException(
             status_code=400,
             detail="Cannot delete conference with existing sessions. Remove sessions first or reassign them.",
@@ -308,13 +314,13 @@ async def delete_conference(
 # Conference sessions
 # ---------------------------
 @router.get("/{conference_id}/sessions", response_model=List[SessionResponse])
-async def get_conference_sessions(
+def get_conference_sessions(
     conference_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get all sessions for a conference"""
-    conference = db.query(Conference).filter(Conference.id == conference_id).first()
+    conference = db.get(Conference, conference_id)
     
     if not conference:
         raise HTTPException(status_code=404, detail="Conference not found")
@@ -323,11 +329,15 @@ async def get_conference_sessions(
     if current_user.role != UserRole.ADMIN.value and conference.status != ConferenceStatus.ACTIVE.value:
         raise HTTPException(status_code=404, detail="Conference not found")
 
-    return conference.sessions or []
+    return (
+        db.query(SessionModel)
+        .filter(SessionModel.conference_id == conference_id)
+        .all()
+    )
 
 
 @router.post("/{conference_id}/sessions/{session_id}")
-async def add_session_to_conference(
+def add_session_to_conference(
     conference_id: int,
     session_id: int,
     current_user: User = Depends(require_admin),
@@ -335,25 +345,21 @@ async def add_session_to_conference(
 ):
     """Add an existing session to a conference (admin only)"""
 
+    # Row lock serializes concurrent adds to the same conference (no-op on SQLite)
     conference = (
         db.query(Conference)
-        .options(selectinload(Conference.sessions))
         .filter(Conference.id == conference_id)
+        .with_for_update()
         .first()
     )
     if not conference:
         raise HTTPException(status_code=404, detail="Conference not found")
 
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+    session = db.get(SessionModel, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # Check max sessions limit
-    if len(conference.sessions or []) >= conference.max_sessions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Conference has reached maximum number of sessions ({conference.max_sessions})",
-        )
+    cap_detail = f"Conference has reached maximum number of sessions ({conference.max_sessions})"
 
     # Validate session dates against the conference window
     s_start = _to_aware(session.start_date)
@@ -367,9 +373,13 @@ async def add_session_to_conference(
         )
 
     # Overlap check vs other sessions already in the conference
-    for other in conference.sessions or []:
-        if other.id == session.id:
-            continue
+    others = db.query(
+        SessionModel.name, SessionModel.start_date, SessionModel.end_date
+    ).filter(
+        SessionModel.conference_id == conference_id,
+        SessionModel.id != session_id,
+    )
+    for other in others:
         o_start = _to_aware(other.start_date)
         o_end = _to_aware(other.end_date)
         if not (s_end <= o_start or s_start >= o_end):
@@ -381,14 +391,29 @@ async def add_session_to_conference(
                 ),
             )
 
-    session.conference_id = conference_id
+    # Count and assignment in one conditional UPDATE so the cap can't be overshot
+    existing = aliased(SessionModel)
+    current_count = (
+        select(func.count(existing.id))
+        .where(existing.conference_id == conference_id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(SessionModel)
+        .where(SessionModel.id == session_id, current_count < conference.max_sessions)
+        .values(conference_id=conference_id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=cap_detail)
     db.commit()
 
     return {"message": "Session added to conference successfully"}
 
 
 @router.delete("/{conference_id}/sessions/{session_id}")
-async def remove_session_from_conference(
+def remove_session_from_conference(
     conference_id: int,
     session_id: int,
     current_user: User = Depends(require_admin),
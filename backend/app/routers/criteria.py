@@ -1,42 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import case, func, lambda_stmt, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
+import hashlib
 
 from app.database import get_db
 from app.models import Criteria, Session as SessionModel, User
-from app.schemas import CriteriaCreate, CriteriaUpdate, CriteriaResponse
-from app.auth import get_current_user, require_admin
+from app.schemas import CriteriaCreate, CriteriaUpdate, CriteriaResponse, TokenData
+from app.auth import get_current_user, require_admin_claims
 
 router = APIRouter(prefix="/criteria", tags=["Criteria"])
 
+# Columns CriteriaResponse serializes, labelled by field name
+_CRITERIA_RESPONSE_COLUMNS = (
+    Criteria.id, Criteria.session_id, Criteria.name, Criteria.description,
+    Criteria.max_score, Criteria.weight, Criteria.order,
+)
+
 
 @router.get("/session/{session_id}", response_model=List[CriteriaResponse])
-async def list_criteria_for_session(
+def list_criteria_for_session(
     session_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """List all criteria for a session"""
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-    if not session:
+    # Plain column rows skip ORM hydration (identity map, relationship state); the
+    # response is built straight from them. lambda_stmt caches the constructed
+    # statement by code location, so only session_id is bound per call.
+    rows = db.execute(lambda_stmt(
+        lambda: select(*_CRITERIA_RESPONSE_COLUMNS)
+        .where(Criteria.session_id == session_id)
+        .order_by(Criteria.order, Criteria.id)
+    )).all()
+    
+    # Only an empty session needs a further query to tell "no criteria" from "no session"
+    if not rows and db.query(SessionModel.id).filter(SessionModel.id == session_id).scalar() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Session not found"
         )
     
-    return db.query(Criteria).filter(
-        Criteria.session_id == session_id
-    ).order_by(Criteria.order).all()
+    # Hashing exactly what the response serializes means any rename, reorder, insert
+    # or delete changes the ETag, independent of timestamp resolution
+    etag = '"{}"'.format(
+        hashlib.blake2b(repr([tuple(row) for row in rows]).encode(), digest_size=16).hexdigest()
+    )
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return [CriteriaResponse.model_construct(**row._mapping) for row in rows]
 
 
 @router.get("/{criteria_id}", response_model=CriteriaResponse)
-async def get_criteria(
+def get_criteria(
     criteria_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get criteria by ID"""
-    criteria = db.query(Criteria).filter(Criteria.id == criteria_id).first()
+    criteria = db.get(Criteria, criteria_id)
     if not criteria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -46,72 +73,85 @@ async def get_criteria(
 
 
 @router.post("", response_model=CriteriaResponse, status_code=status.HTTP_201_CREATED)
-async def create_criteria(
+def create_criteria(
     criteria_data: CriteriaCreate,
-    current_user: User = Depends(require_admin),
+    current_user: TokenData = Depends(require_admin_claims),
     db: Session = Depends(get_db)
 ):
     """Create new criteria (admin only)"""
-    # Check session exists
-    session = db.query(SessionModel).filter(SessionModel.id == criteria_data.session_id).first()
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Session not found"
-        )
-    
-    # Get next order number
-    max_order = db.query(Criteria).filter(
-        Criteria.session_id == criteria_data.session_id
-    ).count()
+    # Append after the current last criterion unless an order was given; MAX(order)
+    # stays correct after deletions and is served by the (session_id, order) index
+    if "order" in criteria_data.model_fields_set:
+        order = criteria_data.order
+    else:
+        order = db.query(func.coalesce(func.max(Criteria.order), -1) + 1).filter(
+            Criteria.session_id == criteria_data.session_id
+        ).scalar()
     
     # Exclude order from model_dump and set it separately
     data = criteria_data.model_dump(exclude={'order'})
-    criteria = Criteria(
-        **data,
-        order=criteria_data.order if criteria_data.order is not None else max_order
-    )
+    criteria = Criteria(**data, order=order)
     
+    # The session_id foreign key stands in for a separate "session exists" SELECT; only
+    # a failed INSERT pays for the lookup that tells a missing session from other errors
     db.add(criteria)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        if db.get(SessionModel, criteria_data.session_id) is not None:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    # Every response field is already set after the flush; serializing before the commit
+    # avoids the reload that expire-on-commit would otherwise trigger
+    response = CriteriaResponse.model_validate(criteria)
     db.commit()
-    db.refresh(criteria)
     
-    return criteria
+    return response
 
 
 @router.put("/{criteria_id}", response_model=CriteriaResponse)
-async def update_criteria(
+def update_criteria(
     criteria_id: int,
     criteria_update: CriteriaUpdate,
-    current_user: User = Depends(require_admin),
+    current_user: TokenData = Depends(require_admin_claims),
     db: Session = Depends(get_db)
 ):
     """Update criteria (admin only)"""
-    criteria = db.query(Criteria).filter(Criteria.id == criteria_id).first()
+    update_data = criteria_update.model_dump(exclude_unset=True)
+    if update_data:
+        # UPDATE ... RETURNING hands back the updated row without a SELECT before or after
+        criteria = db.scalars(
+            update(Criteria)
+            .where(Criteria.id == criteria_id)
+            .values(**update_data)
+            .returning(Criteria)
+        ).one_or_none()
+    else:
+        criteria = db.get(Criteria, criteria_id)
     if not criteria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Criteria not found"
         )
     
-    update_data = criteria_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(criteria, key, value)
-    
+    response = CriteriaResponse.model_validate(criteria)
     db.commit()
-    db.refresh(criteria)
     
-    return criteria
+    return response
 
 
 @router.delete("/{criteria_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_criteria(
+def delete_criteria(
     criteria_id: int,
-    current_user: User = Depends(require_admin),
+    current_user: TokenData = Depends(require_admin_claims),
     db: Session = Depends(get_db)
 ):
     """Delete criteria (admin only)"""
-    criteria = db.query(Criteria).filter(Criteria.id == criteria_id).first()
+    criteria = db.get(Criteria, criteria_id)
     if not criteria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -125,32 +165,55 @@ async def delete_criteria(
 
 
 @router.put("/session/{session_id}/reorder")
-async def reorder_criteria(
+def reorder_criteria(
     session_id: int,
     criteria_order: List[int],  # List of criteria IDs in new order
-    current_user: User = Depends(require_admin),
+    current_user: TokenData = Depends(require_admin_claims),
     db: Session = Depends(get_db)
 ):
     """Reorder criteria for a session (admin only)"""
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+    session = db.get(SessionModel, session_id)
     if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Session not found"
         )
     
-    criteria_list = db.query(Criteria).filter(Criteria.session_id == session_id).all()
-    criteria_ids = {c.id for c in criteria_list}
+    incoming = set(criteria_order)
+    if len(incoming) != len(criteria_order):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate criteria IDs"
+        )
     
-    if set(criteria_order) != criteria_ids:
+    # The IDs match the session's criteria iff every one of them belongs to the session
+    # and the session has no others; both counts come from one aggregate query
+    total, matched = db.query(
+        func.count(Criteria.id),
+        func.count(case((Criteria.id.in_(incoming), Criteria.id)))
+    ).filter(Criteria.session_id == session_id).one()
+    
+    if total != len(incoming) or matched != len(incoming):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Criteria IDs don't match session criteria"
         )
     
-    for order, criteria_id in enumerate(criteria_order):
-        db.query(Criteria).filter(Criteria.id == criteria_id).update({"order": order})
+    # Nothing to reorder; CASE with no WHEN branches would not be valid SQL
+    if not incoming:
+        return {"message": "Criteria reordered successfully"}
     
+    # One UPDATE ... SET "order" = CASE id WHEN ... END touches every row in a single statement
+    new_order = case(
+        {criteria_id: order for order, criteria_id in enumerate(criteria_order)},
+        value=Criteria.id
+    )
+    db.execute(
+        update(Criteria)
+        .where(Criteria.session_id == session_id, Criteria.id.in_(incoming))
+        .values(order=new_order)
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
     
     return {"message": "Criteria reordered successfully"}
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Iterable, List, Optional
 
 from app.database import get_db
-from app.models import Notification, User
+from app.models import Notification, NotificationType, User
 from app.schemas import NotificationResponse, NotificationCreate
 from app.auth import get_current_user
 
@@ -125,3 +125,19 @@ def create_notification(db: Session, notification: NotificationCreate):
     db.commit()
     db.refresh(db_notification)
     return db_notification
+
+
+def create_notifications(
+    db: Session,
+    user_ids: Iterable[int],
+    type: NotificationType,
+    title: str,
+    message: str,
+    link: Optional[str] = None,
+):
+    """Helper function to send the same notification to many users in one INSERT"""
+    db.bulk_save_objects([
+        Notification(user_id=user_id, type=type.value, title=title, message=message, link=link)
+        for user_id in user_ids
+    ])
+    db.commit()
@@ -1,23 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import exists, func, or_, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import BinaryIO, List
+import hashlib
 import os
 import uuid
-from jose import jwt, JWTError
+from urllib.parse import quote
 
 from app.database import get_db
-from app.models import Project, User, UserRole, Tag, ProjectStatus, Session as SessionModel, NotificationType, ProjectTeamInvitation, TeamInvitationStatus
+from app.models import (
+    Project, User, UserRole, Tag, ProjectStatus, Session as SessionModel, NotificationType,
+    ProjectTeamInvitation, TeamInvitationStatus, Review, SiteSettings,
+    project_reviewers, project_tags, project_team_members, reviewer_tags,
+)
 from app.schemas import (
     ProjectCreate, ProjectUpdate, ProjectResponse,
-    ProjectWithStudent, ProjectStatusUpdate, NotificationCreate
+    ProjectWithStudent, ProjectStatusUpdate, NotificationCreate, TokenData
+)
+from app.auth import get_current_user, require_admin, require_student, require_user_token_param
+from app.admin_views import (
+    admin_view_generation, cache_admin_view, get_admin_view, invalidate_admin_views,
 )
-from app.auth import get_current_user, require_admin, require_student
 from app.config import settings
-from app.routers.notifications import create_notification
+from app.routers.notifications import create_notification, create_notifications
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Browsers may reuse a downloaded paper/slides/docs file for this long without asking;
+# after that they revalidate with If-None-Match and get a bodyless 304 if it is unchanged
+DOWNLOAD_CACHE_CONTROL = "private, max-age=300"
+
+
+class _DownloadFileResponse(FileResponse):
+    """FileResponse that reads in UPLOAD_CHUNK_SIZE blocks.
+
+    Starlette's default 64KB chunks mean one threadpool read and one ASGI send per
+    64KB; a 16MB paper goes out in 16 sends instead of 256. Servers offering the
+    http.response.pathsend extension still get the path and send it themselves.
+    """
+    chunk_size = UPLOAD_CHUNK_SIZE
+
+# Relationships serialized by ProjectResponse / ProjectWithStudent, loaded up front
+# so listing N projects costs a fixed number of queries instead of several per project
+_PROJECT_RESPONSE_OPTIONS = (
+    selectinload(Project.tags),
+    selectinload(Project.team_members),
+    selectinload(Project.pending_invitations),
+)
+_PROJECT_WITH_STUDENT_OPTIONS = _PROJECT_RESPONSE_OPTIONS + (
+    selectinload(Project.assigned_reviewers),
+    joinedload(Project.student),
+    joinedload(Project.session),
+)
+
 
 @router.get("/pending-count")
 async def get_pending_projects_count(
@@ -25,21 +64,25 @@ async def get_pending_projects_count(
     db: Session = Depends(get_db)
 ):
     """Get count of pending projects (admin only)"""
-    count = db.query(Project).filter(Project.status == ProjectStatus.PENDING.value).count()
-    return {"pending_count": count}
+    result = get_admin_view(("pending-count",))
+    if result is None:
+        generation = admin_view_generation()
+        count = db.query(Project).filter(Project.status == ProjectStatus.PENDING.value).count()
+        result = {"pending_count": count}
+        cache_admin_view(("pending-count",), result, generation)
+    return result
 
 
 @router.get("", response_model=List[ProjectWithStudent])
 async def list_projects(
     session_id: int = None,
     status: str = None,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """List projects based on user role"""
-    from sqlalchemy import or_
     query = db.query(Project)
     
     # Students see their own projects + projects they are team members of
@@ -70,7 +113,13 @@ async def list_projects(
     if status:
         query = query.filter(Project.status == status)
     
-    return query.order_by(Project.created_at.desc()).offset(skip).limit(limit).all()
+    return (
+        query.options(*_PROJECT_WITH_STUDENT_OPTIONS)
+        .order_by(Project.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
 
 
 @router.get("/my", response_model=List[ProjectResponse])
@@ -84,29 +133,31 @@ async def get_my_projects(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only students can access this endpoint"
         )
-    from sqlalchemy import or_
-    from app.models import Review
-    
-    projects = db.query(Project).filter(
+    projects = db.query(Project).options(*_PROJECT_RESPONSE_OPTIONS).filter(
         or_(
             Project.student_id == current_user.id,
             Project.team_members.any(id=current_user.id)
         )
     ).all()
     
-    # Calculate avg_score and review_count for each project
+    # avg_score and review_count for all projects in one grouped query, counting
+    # only completed reviews that have a total_score
+    review_stats = {}
+    if projects:
+        review_stats = {
+            project_id: (avg_score, review_count)
+            for project_id, avg_score, review_count in db.query(
+                Review.project_id, func.avg(Review.total_score), func.count(Review.total_score)
+            ).filter(
+                Review.project_id.in_([p.id for p in projects]),
+                Review.is_completed == True,  # noqa: E712
+                Review.total_score.isnot(None)
+            ).group_by(Review.project_id)
+        }
+    
     result = []
     for project in projects:
-        reviews = db.query(Review).filter(
-            Review.project_id == project.id,
-            Review.is_completed == True  # noqa: E712
-        ).all()
-        
-        # Calculate average only from reviews that have a total_score
-        reviews_with_scores = [r for r in reviews if r.total_score is not None]
-        avg_score = None
-        if reviews_with_scores:
-            avg_score = sum(r.total_score for r in reviews_with_scores) / len(reviews_with_scores)
+        avg_score, review_count = review_stats.get(project.id, (None, 0))
         
         project_dict = {
             "id": project.id,
@@ -126,8 +177,8 @@ async def get_my_projects(
             "tags": project.tags,
             "team_members": project.team_members,
             "pending_invitations": project.pending_invitations,
-            "review_count": len(reviews_with_scores),
-            "avg_score": avg_score
+            "review_count": review_count,
+            "avg_score": float(avg_score) if avg_score is not None else None
         }
         result.append(project_dict)
     
@@ -163,6 +214,29 @@ async def get_my_pending_invitations(
     return result
 
 
+def _respond_to_invitation(
+    db: Session, invitation_id: int, user: User, new_status: TeamInvitationStatus
+) -> int:
+    """Mark the user's pending invitation as answered; returns its project id (404 if none)."""
+    project_id = db.execute(
+        update(ProjectTeamInvitation)
+        .where(
+            ProjectTeamInvitation.id == invitation_id,
+            ProjectTeamInvitation.email == user.email.lower(),
+            ProjectTeamInvitation.status == TeamInvitationStatus.PENDING
+        )
+        .values(status=new_status, responded_at=func.now())
+        .returning(ProjectTeamInvitation.project_id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if project_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invitation not found or already responded"
+        )
+    return project_id
+
+
 @router.post("/invitations/{invitation_id}/accept")
 async def accept_team_invitation(
     invitation_id: int,
@@ -170,31 +244,24 @@ async def accept_team_invitation(
     db: Session = Depends(get_db)
 ):
     """Accept a team invitation"""
-    invitation = db.query(ProjectTeamInvitation).filter(
-        ProjectTeamInvitation.id == invitation_id,
-        ProjectTeamInvitation.email == current_user.email.lower(),
-        ProjectTeamInvitation.status == TeamInvitationStatus.PENDING
-    ).first()
-    
-    if not invitation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Invitation not found or already responded"
-        )
+    # The existence/ownership check and the status change are one conditional UPDATE;
+    # RETURNING hands back the project id without loading the invitation
+    project_id = _respond_to_invitation(db, invitation_id, current_user, TeamInvitationStatus.ACCEPTED)
     
     # Add user to team members
-    project = invitation.project
-    if current_user not in project.team_members:
-        project.team_members.append(current_user)
-    
-    # Update invitation status
-    invitation.status = TeamInvitationStatus.ACCEPTED
-    from sqlalchemy.sql import func
-    invitation.responded_at = func.now()
+    is_member = db.query(
+        exists().where(
+            project_team_members.c.project_id == project_id,
+            project_team_members.c.user_id == current_user.id
+        )
+    ).scalar()
+    if not is_member:
+        db.execute(project_team_members.insert().values(project_id=project_id, user_id=current_user.id))
     
     db.commit()
+    invalidate_admin_views()
     
-    return {"message": "Invitation accepted", "project_id": project.id}
+    return {"message": "Invitation accepted", "project_id": project_id}
 
 
 @router.post("/invitations/{invitation_id}/decline")
@@ -204,27 +271,30 @@ async def decline_team_invitation(
     db: Session = Depends(get_db)
 ):
     """Decline a team invitation"""
-    invitation = db.query(ProjectTeamInvitation).filter(
-        ProjectTeamInvitation.id == invitation_id,
-        ProjectTeamInvitation.email == current_user.email.lower(),
-        ProjectTeamInvitation.status == TeamInvitationStatus.PENDING
-    ).first()
-    
-    if not invitation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Invitation not found or already responded"
-        )
-    
-    invitation.status = TeamInvitationStatus.DECLINED
-    from sqlalchemy.sql import func
-    invitation.responded_at = func.now()
-    
+    _respond_to_invitation(db, invitation_id, current_user, TeamInvitationStatus.DECLINED)
     db.commit()
+    invalidate_admin_views()
     
     return {"message": "Invitation declined"}
 
 
+def _reviewer_session_counts(db: Session, reviewer_ids) -> dict[int, dict]:
+    """Map reviewer id -> {session_id: number of assigned projects} in one grouped query.
+
+    Projects without a session are counted under the None key.
+    """
+    counts: dict[int, dict] = {}
+    rows = (
+        db.query(project_reviewers.c.user_id, Project.session_id, func.count())
+        .join(Project, Project.id == project_reviewers.c.project_id)
+        .filter(project_reviewers.c.user_id.in_(reviewer_ids))
+        .group_by(project_reviewers.c.user_id, Project.session_id)
+    )
+    for user_id, sid, count in rows:
+        counts.setdefault(user_id, {})[sid] = count
+    return counts
+
+
 # Assignment management routes - MUST come before /{project_id} routes
 @router.get("/assignments/reviewers")
 async def get_all_reviewers_for_assignment(
@@ -233,30 +303,54 @@ async def get_all_reviewers_for_assignment(
     db: Session = Depends(get_db)
 ):
     """Get all approved reviewers with their tags for assignment purposes"""
-    reviewers = db.query(User).filter(
+    cache_key = ("assignments/reviewers", session_id)
+    cached = get_admin_view(cache_key)
+    if cached is not None:
+        return cached
+    generation = admin_view_generation()
+    
+    # Plain column rows: the response is built from a few columns, so the ORM objects
+    # (and their identity-map bookkeeping) would only be overhead
+    reviewers = db.query(User.id, User.full_name, User.email, User.role).filter(
         User.role.in_([UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]),
         User.is_approved == True,  # noqa: E712
         User.is_active == True  # noqa: E712
     ).all()
+    reviewer_ids = [r.id for r in reviewers]
+    
+    tags_by_reviewer: dict[int, list] = {}
+    session_counts = {}
+    if reviewer_ids:
+        tag_rows = (
+            db.query(reviewer_tags.c.user_id, Tag.id, Tag.name)
+            .join(Tag, Tag.id == reviewer_tags.c.tag_id)
+            .filter(reviewer_tags.c.user_id.in_(reviewer_ids))
+        )
+        for user_id, tag_id, tag_name in tag_rows:
+            tags_by_reviewer.setdefault(user_id, []).append({"id": tag_id, "name": tag_name})
+        session_counts = _reviewer_session_counts(db, reviewer_ids)
     
     result = []
     for r in reviewers:
+        counts = session_counts.get(r.id, {})
+        total = sum(counts.values())
         # Count assignments for the specific session if provided
         if session_id:
-            session_count = sum(1 for p in r.assigned_projects if p.session_id == session_id)
+            session_count = counts.get(session_id, 0)
         else:
-            session_count = len(r.assigned_projects)
+            session_count = total
         
         result.append({
             "id": r.id,
             "full_name": r.full_name,
             "email": r.email,
             "role": r.role,
-            "tags": [{"id": t.id, "name": t.name} for t in r.interested_tags],
+            "tags": tags_by_reviewer.get(r.id, []),
             "assigned_projects_count": session_count,
-            "total_assigned_projects": len(r.assigned_projects)
+            "total_assigned_projects": total
         })
     
+    cache_admin_view(cache_key, result, generation)
     return result
 
 
@@ -267,20 +361,89 @@ async def get_all_projects_for_assignment(
     db: Session = Depends(get_db)
 ):
     """Get all approved projects with their tags and assigned reviewers"""
-    query = db.query(Project).filter(Project.status == ProjectStatus.APPROVED.value)
+    cache_key = ("assignments/projects", session_id)
+    cached = get_admin_view(cache_key)
+    if cached is not None:
+        return cached
+    generation = admin_view_generation()
+    
+    # Plain column rows throughout: the response is a flat dict per project, so the
+    # projects, their collections and the reviewers are fetched as tuples, one query each
+    query = (
+        db.query(
+            Project.id, Project.title, Project.poster_number, Project.session_id,
+            SessionModel.name.label("session_name"),
+            User.full_name.label("student_name"), User.email.label("student_email"),
+            Project.advisor_email, Project.supervisor1_email, Project.supervisor2_email,
+        )
+        .join(User, User.id == Project.student_id)
+        .outerjoin(SessionModel, SessionModel.id == Project.session_id)
+        .filter(Project.status == ProjectStatus.APPROVED.value)
+    )
     
     if session_id:
         query = query.filter(Project.session_id == session_id)
     
     projects = query.all()
+    project_ids = [p.id for p in projects]
+    
+    team_by_project: dict[int, list] = {}
+    tags_by_project: dict[int, list] = {}
+    reviewers_by_project: dict[int, list] = {}
+    reviewer_tag_ids: dict[int, list] = {}
+    completed_reviews = {}
+    if project_ids:
+        team_rows = (
+            db.query(project_team_members.c.project_id, User.id, User.full_name, User.email)
+            .join(User, User.id == project_team_members.c.user_id)
+            .filter(project_team_members.c.project_id.in_(project_ids))
+        )
+        for project_id, user_id, full_name, email in team_rows:
+            team_by_project.setdefault(project_id, []).append(
+                {"id": user_id, "full_name": full_name, "email": email}
+            )
+        
+        tag_rows = (
+            db.query(project_tags.c.project_id, Tag.id, Tag.name)
+            .join(Tag, Tag.id == project_tags.c.tag_id)
+            .filter(project_tags.c.project_id.in_(project_ids))
+        )
+        for project_id, tag_id, tag_name in tag_rows:
+            tags_by_project.setdefault(project_id, []).append({"id": tag_id, "name": tag_name})
+        
+        reviewer_rows = (
+            db.query(project_reviewers.c.project_id, User.id, User.full_name, User.email)
+            .join(User, User.id == project_reviewers.c.user_id)
+            .filter(project_reviewers.c.project_id.in_(project_ids))
+            .all()
+        )
+        for project_id, user_id, full_name, email in reviewer_rows:
+            reviewers_by_project.setdefault(project_id, []).append((user_id, full_name, email))
+        
+        assigned_ids = {row[1] for row in reviewer_rows}
+        if assigned_ids:
+            for user_id, tag_id in db.query(reviewer_tags.c.user_id, reviewer_tags.c.tag_id).filter(
+                reviewer_tags.c.user_id.in_(assigned_ids)
+            ):
+                reviewer_tag_ids.setdefault(user_id, []).append(tag_id)
+        
+        # Completed review counts for all listed projects in one grouped query
+        completed_reviews = dict(
+            db.query(Review.project_id, func.count(Review.id))
+            .filter(
+                Review.project_id.in_(project_ids),
+                Review.is_completed == True  # noqa: E712
+            )
+            .group_by(Review.project_id)
+            .all()
+        )
 
     # Build reviewer -> set of touched session ids across ALL approved projects
     # (independent of the optional session_id filter on this endpoint, so the
     # UI can always tell when a reviewer is assigned in every session).
-    from app.models import project_reviewers as project_reviewers_table
     touched_rows = (
-        db.query(project_reviewers_table.c.user_id, Project.session_id)
-        .join(Project, Project.id == project_reviewers_table.c.project_id)
+        db.query(project_reviewers.c.user_id, Project.session_id)
+        .join(Project, Project.id == project_reviewers.c.project_id)
         .filter(
             Project.status == ProjectStatus.APPROVED.value,
             Project.session_id.isnot(None),
@@ -291,37 +454,36 @@ async def get_all_projects_for_assignment(
     for user_id, sid in touched_rows:
         reviewer_touched_sessions.setdefault(user_id, set()).add(sid)
 
-    return [
+    result = [
         {
             "id": p.id,
             "title": p.title,
             "poster_number": p.poster_number,
             "session_id": p.session_id,
-            "session_name": p.session.name if p.session else None,
-            "student_name": p.student.full_name,
-            "student_email": p.student.email,
-            "team_members": [
-                {"id": tm.id, "full_name": tm.full_name, "email": tm.email}
-                for tm in p.team_members
-            ],
+            "session_name": p.session_name,
+            "student_name": p.student_name,
+            "student_email": p.student_email,
+            "team_members": team_by_project.get(p.id, []),
             "advisor_email": p.advisor_email,
             "supervisor1_email": p.supervisor1_email,
             "supervisor2_email": p.supervisor2_email,
-            "tags": [{"id": t.id, "name": t.name} for t in p.tags],
+            "tags": tags_by_project.get(p.id, []),
             "assigned_reviewers": [
                 {
-                    "id": r.id,
-                    "full_name": r.full_name,
-                    "email": r.email,
-                    "tag_ids": [t.id for t in r.interested_tags],
-                    "touched_session_ids": sorted(reviewer_touched_sessions.get(r.id, set())),
+                    "id": user_id,
+                    "full_name": full_name,
+                    "email": email,
+                    "tag_ids": reviewer_tag_ids.get(user_id, []),
+                    "touched_session_ids": sorted(reviewer_touched_sessions.get(user_id, set())),
                 }
-                for r in p.assigned_reviewers
+                for user_id, full_name, email in reviewers_by_project.get(p.id, [])
             ],
-            "reviews_count": len([r for r in p.reviews if r.is_completed])
+            "reviews_count": completed_reviews.get(p.id, 0)
         }
         for p in projects
     ]
+    cache_admin_view(cache_key, result, generation)
+    return result
 
 
 @router.post("/assignments/auto-assign")
@@ -353,8 +515,6 @@ async def auto_assign_reviewers(
     Projects whose supervisors are missing/invalid (or whose constraints are
     unsatisfiable) are skipped and reported as `unassignable_projects`.
     """
-    from app.models import SiteSettings
-
     # --- Resolve config: query param > site_settings > hard-coded default ----
     def _get_setting_int(key: str, fallback: int) -> int:
         s = db.query(SiteSettings).filter(SiteSettings.key == key).first()
@@ -401,6 +561,33 @@ async def auto_assign_reviewers(
 
     reviewers_by_email = {r.email.lower(): r for r in reviewers if r.email}
 
+    # Tag sets as int bitmasks (one bit per tag id), so a tag overlap is one AND + popcount.
+    # They are built straight from the association tables; no Tag objects are loaded.
+    tag_bits: dict[int, int] = {}
+
+    def tag_masks(rows) -> dict[int, int]:
+        masks: dict[int, int] = {}
+        for owner_id, tag_id in rows:
+            masks[owner_id] = masks.get(owner_id, 0) | tag_bits.setdefault(tag_id, 1 << len(tag_bits))
+        return masks
+
+    reviewer_tag_mask = tag_masks(
+        db.query(reviewer_tags.c.user_id, reviewer_tags.c.tag_id)
+        .filter(reviewer_tags.c.user_id.in_([r.id for r in reviewers]))
+    )
+    project_tag_masks = tag_masks(
+        db.query(project_tags.c.project_id, project_tags.c.tag_id)
+        .filter(project_tags.c.project_id.in_([p.id for p in projects]))
+    ) if projects else {}
+
+    # Existing assignments of the projects in scope, as reviewer ids per project
+    assigned_by_project: dict[int, set[int]] = {}
+    if projects:
+        for project_id, user_id in db.query(project_reviewers.c.project_id, project_reviewers.c.user_id).filter(
+            project_reviewers.c.project_id.in_([p.id for p in projects])
+        ):
+            assigned_by_project.setdefault(project_id, set()).add(user_id)
+
     # --- Universe of sessions (for rule 7) ---------------------------------
     all_session_ids = {sid for (sid,) in db.query(SessionModel.id).all()}
     total_sessions = len(all_session_ids)
@@ -410,17 +597,14 @@ async def auto_assign_reviewers(
     total_count: dict[int, int] = {}  # reviewer_id -> total assignments (across all sessions)
     touched_sessions: dict[int, set[int]] = {}  # reviewer_id -> set of session_ids assigned to
 
+    existing_counts = _reviewer_session_counts(db, [r.id for r in reviewers])
     for r in reviewers:
         sess_counts: dict[int, int] = {}
-        touched: set[int] = set()
-        for p in r.assigned_projects:
-            sid = p.session_id or 0
-            sess_counts[sid] = sess_counts.get(sid, 0) + 1
-            if p.session_id is not None:
-                touched.add(p.session_id)
+        for sid, count in existing_counts.get(r.id, {}).items():
+            sess_counts[sid or 0] = sess_counts.get(sid or 0, 0) + count
         per_session_count[r.id] = sess_counts
-        total_count[r.id] = len(r.assigned_projects)
-        touched_sessions[r.id] = touched
+        total_count[r.id] = sum(sess_counts.values())
+        touched_sessions[r.id] = {sid for sid in existing_counts.get(r.id, {}) if sid is not None}
 
     def can_take(reviewer: User, project_session_id: int | None) -> bool:
         """Check rules 5, 6, 7 for assigning this reviewer to a project in
@@ -450,8 +634,8 @@ async def auto_assign_reviewers(
             per_session_count[reviewer.id][0] = per_session_count[reviewer.id].get(0, 0) + 1
         total_count[reviewer.id] += 1
 
-    def tag_score(reviewer: User, project_tag_ids: set[int]) -> int:
-        return len({t.id for t in reviewer.interested_tags} & project_tag_ids)
+    def tag_score(reviewer: User, project_tag_mask: int) -> int:
+        return (reviewer_tag_mask.get(reviewer.id, 0) & project_tag_mask).bit_count()
 
     def would_exhaust_sessions(reviewer: User, project_session_id: int | None) -> int:
         """Soft Rule 7: return 1 if assigning this reviewer to project_session_id
@@ -474,13 +658,13 @@ async def auto_assign_reviewers(
 
     # --- Assignment loop ---------------------------------------------------
     proposed_assignments: list[dict] = []
+    new_pairs: list[dict] = []  # project_reviewers rows to insert when not previewing
     unassignable: list[dict] = []
     assignments_made = 0
 
     for project in projects:
-        project_tag_ids = {t.id for t in project.tags}
-        already_assigned_ids = {r.id for r in project.assigned_reviewers}
-        already_assigned_emails = {r.email.lower() for r in project.assigned_reviewers if r.email}
+        project_tag_mask = project_tag_masks.get(project.id, 0)
+        already_assigned_ids = set(assigned_by_project.get(project.id, ()))
 
         # Resolve supervisors & advisor (by email -> reviewer user)
         sup1 = reviewers_by_email.get((project.supervisor1_email or "").lower()) if project.supervisor1_email else None
@@ -530,11 +714,8 @@ async def auto_assign_reviewers(
                     "role": "supervisor",
                 })
                 assignments_made += 1
-                if not preview:
-                    project.assigned_reviewers.append(x_picked)
+                new_pairs.append({"project_id": project.id, "user_id": x_picked.id})
                 already_assigned_ids.add(x_picked.id)
-                if x_picked.email:
-                    already_assigned_emails.add(x_picked.email.lower())
             else:
                 unassignable.append({
                     "project_id": project.id,
@@ -578,7 +759,7 @@ async def auto_assign_reviewers(
                 key=lambda r: (
                     would_exhaust_sessions(r, project.session_id),
                     opens_new_session(r, project.session_id),
-                    -tag_score(r, project_tag_ids),
+                    -tag_score(r, project_tag_mask),
                     total_count[r.id],
                     per_session_count[r.id].get(project.session_id or 0, 0),
                     r.id,
@@ -593,14 +774,14 @@ async def auto_assign_reviewers(
                 "role": "reviewer",
             })
             assignments_made += 1
-            if not preview:
-                project.assigned_reviewers.append(pick)
+            new_pairs.append({"project_id": project.id, "user_id": pick.id})
             already_assigned_ids.add(pick.id)
-            if pick.email:
-                already_assigned_emails.add(pick.email.lower())
 
-    if not preview:
+    if not preview and new_pairs:
+        # One executemany INSERT instead of a flush per appended collection item
+        db.execute(project_reviewers.insert(), new_pairs)
         db.commit()
+        invalidate_admin_views()
 
     message_prefix = "Preview: " if preview else ""
     return {
@@ -625,17 +806,17 @@ async def clear_all_assignments(
     db: Session = Depends(get_db)
 ):
     """Clear all reviewer assignments (optionally for a specific session)"""
-    project_query = db.query(Project)
+    # A single DELETE on the association table; rowcount is the number cleared
+    stmt = project_reviewers.delete()
     if session_id:
-        project_query = project_query.filter(Project.session_id == session_id)
-    projects = project_query.all()
-    
-    cleared = 0
-    for project in projects:
-        cleared += len(project.assigned_reviewers)
-        project.assigned_reviewers = []
-    
+        stmt = stmt.where(
+            project_reviewers.c.project_id.in_(
+                db.query(Project.id).filter(Project.session_id == session_id)
+            )
+        )
+    cleared = db.execute(stmt).rowcount
     db.commit()
+    invalidate_admin_views()
     
     return {"message": f"Cleared {cleared} assignments"}
 
@@ -664,6 +845,7 @@ async def get_advised_projects(
 
     projects = (
         db.query(Project)
+        .options(*_PROJECT_WITH_STUDENT_OPTIONS)
         .filter(Project.advisor_email.ilike(current_user.email))
         .order_by(Project.created_at.desc())
         .all()
@@ -678,7 +860,9 @@ async def get_project(
     db: Session = Depends(get_db)
 ):
     """Get project by ID"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # team_members is serialized in the response anyway, so loading it up front
+    # also serves the student membership check below
+    project = db.query(Project).options(*_PROJECT_WITH_STUDENT_OPTIONS).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -764,30 +948,31 @@ async def create_project(
         )
         db.add(invitation)
     db.commit()
+    invalidate_admin_views()
     db.refresh(project)
     
     # Notify team members about being added
-    for member in team_members:
-        notification = NotificationCreate(
-            user_id=member.id,
+    if team_members:
+        create_notifications(
+            db,
+            [member.id for member in team_members],
             type=NotificationType.GENERAL,
             title="Added to Project Team",
             message=f'You have been added to the project "{project.title}" by {current_user.full_name}.',
             link="/projects"
         )
-        create_notification(db, notification)
     
     # Notify all admins about new project submission
-    admins = db.query(User).filter(User.role == UserRole.ADMIN.value).all()
-    for admin in admins:
-        notification = NotificationCreate(
-            user_id=admin.id,
+    admin_ids = [admin_id for (admin_id,) in db.query(User.id).filter(User.role == UserRole.ADMIN.value)]
+    if admin_ids:
+        create_notifications(
+            db,
+            admin_ids,
             type=NotificationType.GENERAL,
             title="New Project Submission",
             message=f'New project "{project.title}" submitted by {current_user.full_name}.',
             link="/admin/projects"
         )
-        create_notification(db, notification)
     
     return project
 
@@ -838,6 +1023,7 @@ async def update_project(
         setattr(project, key, value)
     
     db.commit()
+    invalidate_admin_views()
     db.refresh(project)
     
     return project
@@ -864,12 +1050,11 @@ async def update_project_status(
         project.poster_number = status_update.poster_number
     
     db.commit()
+    invalidate_admin_views()
     db.refresh(project)
     
     # Send notification if status changed
     if old_status != project.status:
-        from app.models import NotificationType
-        
         if project.status == ProjectStatus.APPROVED.value:
             notification = NotificationCreate(
                 user_id=project.student_id,
@@ -924,10 +1109,34 @@ async def delete_project(
     
     db.delete(project)
     db.commit()
+    invalidate_admin_views()
     
     return None
 
 
+def _write_upload(src: BinaryIO, file_path: str) -> None:
+    """Copy an upload to file_path in chunks, enforcing MAX_FILE_SIZE as it goes.
+
+    Memory stays bounded by UPLOAD_CHUNK_SIZE; an oversize upload is rejected as
+    soon as it passes the limit and the partial file removed.
+    """
+    total = 0
+    try:
+        with open(file_path, "wb") as f:
+            while chunk := src.read(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if total > settings.MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File size exceeds {settings.MAX_FILE_SIZE // (1024*1024)}MB limit"
+                    )
+                f.write(chunk)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+
 async def save_uploaded_file(file: UploadFile, folder: str) -> str:
     """Helper to save uploaded file"""
     ext = file.filename.split(".")[-1].lower()
@@ -938,24 +1147,59 @@ async def save_uploaded_file(file: UploadFile, folder: str) -> str:
         )
     
     upload_dir = os.path.join(settings.UPLOAD_DIR, folder)
-    os.makedirs(upload_dir, exist_ok=True)
     
     filename = f"{uuid.uuid4()}.{ext}"
     file_path = os.path.join(upload_dir, filename)
     
-    content = await file.read()
-    if len(content) > settings.MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size exceeds {settings.MAX_FILE_SIZE // (1024*1024)}MB limit"
-        )
-    
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Blocking reads and writes run in the threadpool so the event loop stays free
+    await run_in_threadpool(_write_upload, file.file, file_path)
     
     return file_path
 
 
+def _file_download_response(path: str, filename: str, stat_result: os.stat_result, etag: str) -> Response:
+    """Send a stored upload as an attachment.
+
+    With ACCEL_REDIRECT_PREFIX set, NGINX serves the file itself (sendfile, no
+    Python in the data path, its own ETag handling); otherwise
+    _DownloadFileResponse streams it from disk.
+    """
+    if settings.ACCEL_REDIRECT_PREFIX:
+        relative = os.path.relpath(path, settings.UPLOAD_DIR).replace(os.sep, "/")
+        # Same Content-Disposition FileResponse would send
+        quoted = quote(filename)
+        if quoted != filename:
+            disposition = f"attachment; filename*=utf-8''{quoted}"
+        else:
+            disposition = f'attachment; filename="{filename}"'
+        return Response(
+            media_type="application/octet-stream",
+            headers={
+                "X-Accel-Redirect": settings.ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(relative),
+                "Content-Disposition": disposition,
+                "Cache-Control": DOWNLOAD_CACHE_CONTROL,
+            },
+        )
+    return _DownloadFileResponse(
+        path,
+        filename=filename,
+        media_type='application/octet-stream',
+        stat_result=stat_result,
+        headers={"ETag": etag, "Cache-Control": DOWNLOAD_CACHE_CONTROL},
+    )
+
+
+def _remove_stored_file(stored_path: str) -> None:
+    """Delete an uploaded file from disk; one that is already gone is not an error.
+
+    Callers run this in the threadpool so the unlink never blocks the event loop.
+    """
+    try:
+        os.remove(stored_path)
+    except FileNotFoundError:
+        pass
+
+
 @router.post("/{project_id}/paper", response_model=ProjectResponse)
 async def upload_paper(
     project_id: int,
@@ -977,9 +1221,12 @@ async def upload_paper(
             detail="Access denied"
         )
     
+    # End the read transaction so its pooled connection is free while the file is written
+    db.commit()
     file_path = await save_uploaded_file(file, "papers")
     project.paper_path = file_path
     db.commit()
+    invalidate_admin_views()
     db.refresh(project)
     
     return project
@@ -1006,9 +1253,12 @@ async def upload_slides(
             detail="Access denied"
         )
     
+    # End the read transaction so its pooled connection is free while the file is written
+    db.commit()
     file_path = await save_uploaded_file(file, "slides")
     project.slides_path = file_path
     db.commit()
+    invalidate_admin_views()
     db.refresh(project)
     
     return project
@@ -1035,126 +1285,119 @@ async def upload_additional_docs(
             detail="Access denied"
         )
     
+    # End the read transaction so its pooled connection is free while the file is written
+    db.commit()
     file_path = await save_uploaded_file(file, "docs")
     project.additional_docs_path = file_path
     db.commit()
+    invalidate_admin_views()
     db.refresh(project)
     
     return project
 
 
-@router.get("/{project_id}/paper/download")
-async def download_paper(
-    project_id: int,
-    token: str = Query(...),
-    db: Session = Depends(get_db)
-):
-    """Download paper for project (authenticated users)"""
-    # Verify token
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def _download_project_file(
+    request: Request, db: Session, user: TokenData, project_id: int,
+    path_attr: str, suffix: str, missing_detail: str
+) -> Response:
+    """Shared body of the paper/slides/docs download endpoints."""
+    path_column = getattr(Project, path_attr)
+    # The user comes from the token caches, so this is the request's only query; it
+    # reads just the columns the permission check and the response use
+    project = db.query(
+        Project.title, Project.student_id, Project.status, path_column.label("path")
+    ).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
     # Check access permissions
-    if user.role == UserRole.STUDENT.value and project.student_id != user.id:
+    if user.role == UserRole.STUDENT.value and project.student_id != user.user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
     elif user.role in [UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]:
         if project.status != ProjectStatus.APPROVED.value:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Project not yet approved")
     
-    if not project.paper_path or not os.path.exists(project.paper_path):
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paper not found")
+    # One stat both confirms the file exists and versions it; FileResponse reuses it
+    stat_result = None
+    if project.path:
+        try:
+            stat_result = await run_in_threadpool(os.stat, project.path)
+        except FileNotFoundError:
+            pass
+    if stat_result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=missing_detail)
+    
+    etag = '"{}"'.format(hashlib.blake2b(
+        f"{project.path}:{stat_result.st_mtime_ns}:{stat_result.st_size}".encode(), digest_size=16
+    ).hexdigest())
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": DOWNLOAD_CACHE_CONTROL},
+        )
     
-    filename = f"{project.title.replace(' ', '_')}_paper{os.path.splitext(project.paper_path)[1]}"
-    return FileResponse(project.paper_path, filename=filename, media_type='application/octet-stream')
+    filename = f"{project.title.replace(' ', '_')}_{suffix}{os.path.splitext(project.path)[1]}"
+    return _file_download_response(project.path, filename, stat_result, etag)
+
+
+@router.get("/{project_id}/paper/download")
+async def download_paper(
+    project_id: int,
+    request: Request,
+    user: TokenData = Depends(require_user_token_param),
+    db: Session = Depends(get_db)
+):
+    """Download paper for project (authenticated users)"""
+    return await _download_project_file(
+        request, db, user, project_id, "paper_path", "paper", "Paper not found"
+    )
 
 
 @router.get("/{project_id}/slides/download")
 async def download_slides(
     project_id: int,
-    token: str = Query(...),
+    request: Request,
+    user: TokenData = Depends(require_user_token_param),
     db: Session = Depends(get_db)
 ):
     """Download slides for project (authenticated users)"""
-    # Verify token
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    
-    # Check access permissions
-    if user.role == UserRole.STUDENT.value and project.student_id != user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    elif user.role in [UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]:
-        if project.status != ProjectStatus.APPROVED.value:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Project not yet approved")
-    
-    if not project.slides_path or not os.path.exists(project.slides_path):
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Slides not found")
-    
-    filename = f"{project.title.replace(' ', '_')}_slides{os.path.splitext(project.slides_path)[1]}"
-    return FileResponse(project.slides_path, filename=filename, media_type='application/octet-stream')
+    return await _download_project_file(
+        request, db, user, project_id, "slides_path", "slides", "Slides not found"
+    )
 
 
 @router.get("/{project_id}/docs/download")
 async def download_docs(
     project_id: int,
-    token: str = Query(...),
+    request: Request,
+    user: TokenData = Depends(require_user_token_param),
     db: Session = Depends(get_db)
 ):
     """Download additional docs for project (authenticated users)"""
-    # Verify token
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    
+    return await _download_project_file(
+        request, db, user, project_id, "additional_docs_path", "docs", "Additional documents not found"
+    )
+
+
+async def _delete_project_file(db: Session, current_user: User, project_id: int, path_attr: str) -> Project:
+    """Shared body of the paper/slides/docs delete endpoints."""
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    # Check access permissions
-    if user.role == UserRole.STUDENT.value and project.student_id != user.id:
+    if project.student_id != current_user.id and current_user.role != UserRole.ADMIN.value:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    elif user.role in [UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]:
-        if project.status != ProjectStatus.APPROVED.value:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Project not yet approved")
     
-    if not project.additional_docs_path or not os.path.exists(project.additional_docs_path):
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Additional documents not found")
+    stored_path = getattr(project, path_attr)
+    if stored_path:
+        await run_in_threadpool(_remove_stored_file, stored_path)
+        setattr(project, path_attr, None)
+        db.commit()
+        invalidate_admin_views()
+        db.refresh(project)
     
-    filename = f"{project.title.replace(' ', '_')}_docs{os.path.splitext(project.additional_docs_path)[1]}"
-    return FileResponse(project.additional_docs_path, filename=filename, media_type='application/octet-stream')
+    return project
 
 
 @router.delete("/{project_id}/paper", response_model=ProjectResponse)
@@ -1164,22 +1407,7 @@ async def delete_paper(
     db: Session = Depends(get_db)
 ):
     """Delete paper from project (owner or admin)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    
-    if project.student_id != current_user.id and current_user.role != UserRole.ADMIN.value:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    
-    if project.paper_path:
-        file_to_delete = os.path.join(settings.UPLOAD_DIR, project.paper_path.replace("/uploads/", ""))
-        if os.path.exists(file_to_delete):
-            os.remove(file_to_delete)
-        project.paper_path = None
-        db.commit()
-        db.refresh(project)
-    
-    return project
+    return await _delete_project_file(db, current_user, project_id, "paper_path")
 
 
 @router.delete("/{project_id}/slides", response_model=ProjectResponse)
@@ -1189,22 +1417,7 @@ async def delete_slides(
     db: Session = Depends(get_db)
 ):
     """Delete slides from project (owner or admin)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    
-    if project.student_id != current_user.id and current_user.role != UserRole.ADMIN.value:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    
-    if project.slides_path:
-        file_to_delete = os.path.join(settings.UPLOAD_DIR, project.slides_path.replace("/uploads/", ""))
-        if os.path.exists(file_to_delete):
-            os.remove(file_to_delete)
-        project.slides_path = None
-        db.commit()
-        db.refresh(project)
-    
-    return project
+    return await _delete_project_file(db, current_user, project_id, "slides_path")
 
 
 @router.delete("/{project_id}/docs", response_model=ProjectResponse)
@@ -1214,22 +1427,7 @@ async def delete_docs(
     db: Session = Depends(get_db)
 ):
     """Delete additional docs from project (owner or admin)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    
-    if project.student_id != current_user.id and current_user.role != UserRole.ADMIN.value:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    
-    if project.additional_docs_path:
-        file_to_delete = os.path.join(settings.UPLOAD_DIR, project.additional_docs_path.replace("/uploads/", ""))
-        if os.path.exists(file_to_delete):
-            os.remove(file_to_delete)
-        project.additional_docs_path = None
-        db.commit()
-        db.refresh(project)
-    
-    return project
+    return await _delete_project_file(db, current_user, project_id, "additional_docs_path")
 
 
 @router.put("/{project_id}/reassign-student/{student_id}", response_model=ProjectResponse)
@@ -1259,6 +1457,7 @@ async def reassign_project_student(
     
     project.student_id = student_id
     db.commit()
+    invalidate_admin_views()
     db.refresh(project)
     
     return project
@@ -1289,6 +1488,7 @@ async def reassign_project_session(
     
     project.session_id = session_id
     db.commit()
+    invalidate_admin_views()
     db.refresh(project)
     
     return project
@@ -1318,7 +1518,7 @@ async def assign_reviewer_to_project(
     db: Session = Depends(get_db)
 ):
     """Assign a reviewer to a project (admin only)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project.id, Project.session_id).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1341,7 +1541,15 @@ async def assign_reviewer_to_project(
             detail="Reviewer is not approved"
         )
     
-    if reviewer in project.assigned_reviewers:
+    # Membership and the session limit are answered from the association table
+    # without loading either side's collection
+    already_assigned = db.query(
+        exists().where(
+            project_reviewers.c.project_id == project_id,
+            project_reviewers.c.user_id == reviewer_id
+        )
+    ).scalar()
+    if already_assigned:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Reviewer already assigned to this project"
@@ -1349,8 +1557,15 @@ async def assign_reviewer_to_project(
     
     # Check 4-project limit per session
     if project.session_id:
-        session_assignments = sum(
-            1 for p in reviewer.assigned_projects if p.session_id == project.session_id
+        session_assignments = (
+            db.query(func.count())
+            .select_from(project_reviewers)
+            .join(Project, Project.id == project_reviewers.c.project_id)
+            .filter(
+                project_reviewers.c.user_id == reviewer_id,
+                Project.session_id == project.session_id
+            )
+            .scalar()
         )
         if session_assignments >= 4:
             raise HTTPException(
@@ -1358,8 +1573,9 @@ async def assign_reviewer_to_project(
                 detail="Reviewer has reached the maximum of 4 projects for this session"
             )
     
-    project.assigned_reviewers.append(reviewer)
+    db.execute(project_reviewers.insert().values(project_id=project_id, user_id=reviewer_id))
     db.commit()
+    invalidate_admin_views()
     
     return {"message": "Reviewer assigned successfully"}
 
@@ -1372,28 +1588,33 @@ async def unassign_reviewer_from_project(
     db: Session = Depends(get_db)
 ):
     """Remove a reviewer from a project (admin only)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    if db.query(Project.id).filter(Project.id == project_id).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    reviewer = db.query(User).filter(User.id == reviewer_id).first()
-    if not reviewer:
+    if db.query(User.id).filter(User.id == reviewer_id).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reviewer not found"
         )
     
-    if reviewer not in project.assigned_reviewers:
+    # The DELETE doubles as the membership test: no row removed means not assigned
+    removed = db.execute(
+        project_reviewers.delete().where(
+            project_reviewers.c.project_id == project_id,
+            project_reviewers.c.user_id == reviewer_id
+        )
+    ).rowcount
+    if not removed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Reviewer is not assigned to this project"
         )
     
-    project.assigned_reviewers.remove(reviewer)
     db.commit()
+    invalidate_admin_views()
     
     return {"message": "Reviewer unassigned successfully"}
 
@@ -1431,14 +1652,14 @@ async def add_team_member(
     db: Session = Depends(get_db)
 ):
     """Add a student as team member to a project (admin only)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project.id, Project.student_id).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    student = db.query(User).filter(
+    student = db.query(User.id).filter(
         User.id == student_id,
         User.role == UserRole.STUDENT.value
     ).first()
@@ -1455,14 +1676,21 @@ async def add_team_member(
             detail="Cannot add project owner as team member"
         )
     
-    if student in project.team_members:
+    is_member = db.query(
+        exists().where(
+            project_team_members.c.project_id == project_id,
+            project_team_members.c.user_id == student_id
+        )
+    ).scalar()
+    if is_member:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Student is already a team member"
         )
     
-    project.team_members.append(student)
+    db.execute(project_team_members.insert().values(project_id=project_id, user_id=student_id))
     db.commit()
+    invalidate_admin_views()
     
     return {"message": "Team member added successfully"}
 
@@ -1475,27 +1703,32 @@ async def remove_team_member(
     db: Session = Depends(get_db)
 ):
     """Remove a team member from a project (admin only)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    if db.query(Project.id).filter(Project.id == project_id).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    student = db.query(User).filter(User.id == student_id).first()
-    if not student:
+    if db.query(User.id).filter(User.id == student_id).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student not found"
         )
     
-    if student not in project.team_members:
+    # The DELETE doubles as the membership test: no row removed means not a member
+    removed = db.execute(
+        project_team_members.delete().where(
+            project_team_members.c.project_id == project_id,
+            project_team_members.c.user_id == student_id
+        )
+    ).rowcount
+    if not removed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Student is not a team member of this project"
         )
     
-    project.team_members.remove(student)
     db.commit()
+    invalidate_admin_views()
     
     return {"message": "Team member removed successfully"}
\ No newline at end of file
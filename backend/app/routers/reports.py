@@ -1,134 +1,124 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, case, func
+from typing import Iterable, Iterator
+from itertools import chain
 import csv
 import io
 from datetime import datetime
-from jose import JWTError, jwt
 
 from app.database import get_db
 from app.models import (
     Session as SessionModel, User, UserRole, Project, Review, 
-    ProjectStatus, SessionStatus
+    ProjectStatus, SessionStatus, project_reviewers
 )
-from app.auth import require_admin
-from app.config import settings
+from app.auth import require_admin, require_user_token_param
+from app.schemas import AdminOverview, SessionDetailsReport, TokenData
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+CSV_FLUSH_ROWS = 500  # rows encoded per chunk of a streamed CSV export
+EXPORT_BATCH_SIZE = 500  # rows fetched per batch while iterating an export query
 
-def get_user_from_token(token: str, db: Session) -> User:
-    """Validate token and get user for download endpoints"""
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id_str: str = payload.get("sub")
-        if user_id_str is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user_id = int(user_id_str)
-    except (JWTError, ValueError):
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(status_code=401, detail="User not found")
+# Relationships a project's report row reads, loaded per batch instead of per project.
+# Review tallies come from the project's completed_reviews_count / avg_score columns.
+_PROJECT_REPORT_OPTIONS = (
+    joinedload(Project.student),
+    selectinload(Project.tags),
+    selectinload(Project.assigned_reviewers),
+)
+
+
+def require_admin_download(user: TokenData = Depends(require_user_token_param)) -> TokenData:
+    """Validate the ?token= of a download link and require an admin.
+
+    Token decoding and the role lookup go through the shared caches in app.auth,
+    so repeated exports skip both the signature check and the user SELECT.
+    """
     if user.role != UserRole.ADMIN.value:
         raise HTTPException(status_code=403, detail="Admin access required")
-    
     return user
 
 
-@router.get("/overview")
+@router.get("/overview", response_model=AdminOverview)
 async def get_admin_overview(
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Get comprehensive admin overview statistics"""
+    # The response_model lets pydantic-core validate and encode the payload straight to
+    # JSON bytes, skipping jsonable_encoder's pass over plain dicts
     
-    # User statistics
-    total_users = db.query(User).count()
-    students = db.query(User).filter(User.role == UserRole.STUDENT.value).count()
-    internal_reviewers = db.query(User).filter(User.role == UserRole.INTERNAL_REVIEWER.value).count()
-    external_reviewers = db.query(User).filter(User.role == UserRole.EXTERNAL_REVIEWER.value).count()
-    admins = db.query(User).filter(User.role == UserRole.ADMIN.value).count()
-    pending_approval = db.query(User).filter(
-        User.role.in_([UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]),
-        User.is_approved == False  # noqa: E712
-    ).count()
+    # One aggregate query per table; each COUNT(CASE ...) tallies one bucket in the same scan
+    reviewer_roles = [UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value]
+    users = db.query(
+        func.count(User.id).label("total"),
+        func.count(case((User.role == UserRole.STUDENT.value, User.id))).label("students"),
+        func.count(case((User.role == UserRole.INTERNAL_REVIEWER.value, User.id))).label("internal_reviewers"),
+        func.count(case((User.role == UserRole.EXTERNAL_REVIEWER.value, User.id))).label("external_reviewers"),
+        func.count(case((User.role == UserRole.ADMIN.value, User.id))).label("admins"),
+        func.count(case((
+            and_(User.role.in_(reviewer_roles), User.is_approved == False),  # noqa: E712
+            User.id
+        ))).label("pending_approval"),
+    ).one()
     
-    # Session statistics
-    total_sessions = db.query(SessionModel).count()
-    active_sessions = db.query(SessionModel).filter(SessionModel.status == SessionStatus.ACTIVE.value).count()
-    upcoming_sessions = db.query(SessionModel).filter(SessionModel.status == SessionStatus.UPCOMING.value).count()
-    completed_sessions = db.query(SessionModel).filter(SessionModel.status == SessionStatus.COMPLETED.value).count()
+    sessions = db.query(
+        func.count(SessionModel.id).label("total"),
+        func.count(case((SessionModel.status == SessionStatus.ACTIVE.value, SessionModel.id))).label("active"),
+        func.count(case((SessionModel.status == SessionStatus.UPCOMING.value, SessionModel.id))).label("upcoming"),
+        func.count(case((SessionModel.status == SessionStatus.COMPLETED.value, SessionModel.id))).label("completed"),
+    ).one()
     
-    # Project statistics
-    total_projects = db.query(Project).count()
-    pending_projects = db.query(Project).filter(Project.status == ProjectStatus.PENDING.value).count()
-    approved_projects = db.query(Project).filter(Project.status == ProjectStatus.APPROVED.value).count()
-    rejected_projects = db.query(Project).filter(Project.status == ProjectStatus.REJECTED.value).count()
+    projects = db.query(
+        func.count(Project.id).label("total"),
+        func.count(case((Project.status == ProjectStatus.PENDING.value, Project.id))).label("pending"),
+        func.count(case((Project.status == ProjectStatus.APPROVED.value, Project.id))).label("approved"),
+        func.count(case((Project.status == ProjectStatus.REJECTED.value, Project.id))).label("rejected"),
+    ).one()
     
-    # Review statistics
-    total_reviews = db.query(Review).count()
-    completed_reviews = db.query(Review).filter(Review.is_completed == True).count()  # noqa: E712
-    pending_reviews = db.query(Review).filter(Review.is_completed == False).count()  # noqa: E712
-    
-    # Calculate average score
-    avg_score = db.query(func.avg(Review.total_score)).filter(
-        Review.is_completed == True,  # noqa: E712
-        Review.total_score.isnot(None)
-    ).scalar() or 0
+    # AVG skips NULLs, so scoring only completed reviews also drops unscored ones
+    reviews = db.query(
+        func.count(Review.id).label("total"),
+        func.count(case((Review.is_completed == True, Review.id))).label("completed"),  # noqa: E712
+        func.count(case((Review.is_completed == False, Review.id))).label("pending"),  # noqa: E712
+        func.avg(case((Review.is_completed == True, Review.total_score))).label("average_score"),  # noqa: E712
+    ).one()
     
     return {
-        "users": {
-            "total": total_users,
-            "students": students,
-            "internal_reviewers": internal_reviewers,
-            "external_reviewers": external_reviewers,
-            "admins": admins,
-            "pending_approval": pending_approval
-        },
-        "sessions": {
-            "total": total_sessions,
-            "active": active_sessions,
-            "upcoming": upcoming_sessions,
-            "completed": completed_sessions
-        },
-        "projects": {
-            "total": total_projects,
-            "pending": pending_projects,
-            "approved": approved_projects,
-            "rejected": rejected_projects
-        },
+        "users": users._asdict(),
+        "sessions": sessions._asdict(),
+        "projects": projects._asdict(),
         "reviews": {
-            "total": total_reviews,
-            "completed": completed_reviews,
-            "pending": pending_reviews,
-            "average_score": round(avg_score, 2)
+            **reviews._asdict(),
+            "average_score": round(reviews.average_score or 0, 2)
         }
     }
 
 
-@router.get("/sessions/{session_id}/details")
+@router.get("/sessions/{session_id}/details", response_model=SessionDetailsReport)
 async def get_session_details(
     session_id: int,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Get detailed report for a specific session"""
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+    session = db.query(SessionModel).options(selectinload(SessionModel.tags)).filter(
+        SessionModel.id == session_id
+    ).first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Get projects in this session
-    projects = db.query(Project).filter(Project.session_id == session_id).all()
+    # Get projects in this session, with everything the report reads loaded up front
+    # so the whole report costs a fixed number of queries instead of several per project
+    # Reviews are still needed here for the total and the per-reviewer tallies
+    projects = db.query(Project).options(
+        *_PROJECT_REPORT_OPTIONS, selectinload(Project.reviews)
+    ).filter(Project.session_id == session_id).all()
     
     project_details = []
     for project in projects:
-        reviews = db.query(Review).filter(Review.project_id == project.id).all()
-        completed_reviews = [r for r in reviews if r.is_completed]
-        avg_score = sum(r.total_score for r in completed_reviews if r.total_score) / len(completed_reviews) if completed_reviews else 0
-        
         project_details.append({
             "id": project.id,
             "title": project.title,
@@ -141,39 +131,39 @@ async def get_session_details(
                 for r in project.assigned_reviewers
             ],
             "reviews": {
-                "total": len(reviews),
-                "completed": len(completed_reviews),
-                "average_score": round(avg_score, 2)
+                "total": len(project.reviews),
+                "completed": project.completed_reviews_count,
+                "average_score": round(project.avg_score or 0, 2)
             },
-            "created_at": project.created_at.isoformat() if project.created_at else None
+            "created_at": project.created_at
         })
     
-    # Get reviewers assigned to projects in this session
-    reviewers_in_session = set()
+    # Reviewers assigned to projects in this session, with their per-session tallies
+    # counted from the projects and reviews already loaded above
+    reviewers_in_session = {}
+    assigned_counts = {}
+    completed_counts = {}
     for project in projects:
         for reviewer in project.assigned_reviewers:
-            reviewers_in_session.add(reviewer.id)
+            reviewers_in_session[reviewer.id] = reviewer
+            assigned_counts[reviewer.id] = assigned_counts.get(reviewer.id, 0) + 1
+        for review in project.reviews:
+            if review.is_completed:
+                completed_counts[review.reviewer_id] = completed_counts.get(review.reviewer_id, 0) + 1
     
     reviewer_stats = []
-    for reviewer_id in reviewers_in_session:
-        reviewer = db.query(User).filter(User.id == reviewer_id).first()
-        if reviewer:
-            session_projects = [p for p in reviewer.assigned_projects if p.session_id == session_id]
-            session_reviews = db.query(Review).join(Project).filter(
-                Review.reviewer_id == reviewer_id,
-                Project.session_id == session_id
-            ).all()
-            completed = [r for r in session_reviews if r.is_completed]
-            
-            reviewer_stats.append({
-                "id": reviewer.id,
-                "name": reviewer.full_name,
-                "email": reviewer.email,
-                "role": reviewer.role,
-                "assigned_projects": len(session_projects),
-                "completed_reviews": len(completed),
-                "pending_reviews": len(session_projects) - len(completed)
-            })
+    for reviewer in reviewers_in_session.values():
+        assigned = assigned_counts[reviewer.id]
+        completed = completed_counts.get(reviewer.id, 0)
+        reviewer_stats.append({
+            "id": reviewer.id,
+            "name": reviewer.full_name,
+            "email": reviewer.email,
+            "role": reviewer.role,
+            "assigned_projects": assigned,
+            "completed_reviews": completed,
+            "pending_reviews": assigned - completed
+        })
     
     return {
         "session": {
@@ -181,8 +171,8 @@ async def get_session_details(
             "name": session.name,
             "description": session.description,
             "status": session.status,
-            "start_date": session.start_date.isoformat() if session.start_date else None,
-            "end_date": session.end_date.isoformat() if session.end_date else None,
+            "start_date": session.start_date,
+            "end_date": session.end_date,
             "location": session.location,
             "max_projects": session.max_projects,
             "tags": [t.name for t in session.tags]
@@ -201,38 +191,38 @@ async def get_session_details(
     }
 
 
-@router.get("/sessions/{session_id}/export")
-async def export_session_report(
-    session_id: int,
-    token: str = Query(..., description="Authentication token"),
-    db: Session = Depends(get_db)
-):
-    """Export session report as CSV"""
-    # Validate admin token
-    get_user_from_token(token, db)
-    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Get projects with reviews
-    projects = db.query(Project).filter(Project.session_id == session_id).all()
-    
-    # Create CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Header
-    writer.writerow([
+def _stream_csv(rows: Iterable[list]) -> Iterator[str]:
+    """Encode rows as CSV text, handing it out every CSV_FLUSH_ROWS rows.
+
+    Starlette runs a sync iterator in the threadpool, so the blocking queries that
+    produce the rows stay off the event loop and only one batch is held in memory.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % CSV_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _session_report_rows(db: Session, session_id: int) -> Iterator[list]:
+    yield [
         'Project ID', 'Project Title', 'Student Name', 'Student Email',
         'Status', 'Tags', 'Assigned Reviewers', 'Completed Reviews',
         'Average Score', 'Created At'
-    ])
+    ]
     
+    # yield_per fetches and eager-loads EXPORT_BATCH_SIZE projects at a time, so memory
+    # is bounded by the batch rather than the session's size
+    projects = db.query(Project).options(*_PROJECT_REPORT_OPTIONS).filter(
+        Project.session_id == session_id
+    ).yield_per(EXPORT_BATCH_SIZE)
     for project in projects:
-        reviews = [r for r in project.reviews if r.is_completed]
-        avg_score = sum(r.total_score for r in reviews if r.total_score) / len(reviews) if reviews else 0
-        
-        writer.writerow([
+        yield [
             project.id,
             project.title,
             project.student.full_name,
@@ -240,92 +230,115 @@ async def export_session_report(
             project.status,
             ', '.join([t.name for t in project.tags]),
             ', '.join([r.full_name for r in project.assigned_reviewers]),
-            len(reviews),
-            round(avg_score, 2),
+            project.completed_reviews_count,
+            round(project.avg_score or 0, 2),
             project.created_at.strftime('%Y-%m-%d %H:%M') if project.created_at else ''
-        ])
-    
-    output.seek(0)
+        ]
+
+
+@router.get("/sessions/{session_id}/export")
+async def export_session_report(
+    session_id: int,
+    current_user: TokenData = Depends(require_admin_download),
+    db: Session = Depends(get_db)
+):
+    """Export session report as CSV"""
+    session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
     
     filename = f"session_{session_id}_{session.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv"
     
+    # Rows are queried and encoded as the response is sent; the request-scoped DB
+    # session stays open until streaming finishes (yield dependencies are torn down
+    # after the response since FastAPI 0.118, the minimum in requirements.txt)
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _stream_csv(_session_report_rows(db, session_id)),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
-@router.get("/export/all")
-async def export_all_data(
-    token: str = Query(..., description="Authentication token"),
-    db: Session = Depends(get_db)
-):
-    """Export comprehensive report of all data"""
-    # Validate admin token
-    get_user_from_token(token, db)
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Sessions overview
-    writer.writerow(['=== SESSIONS ==='])
-    writer.writerow(['ID', 'Name', 'Status', 'Start Date', 'End Date', 'Location', 'Projects Count'])
-    sessions = db.query(SessionModel).all()
+def _export_session_rows(db: Session) -> Iterator[list]:
+    yield ['=== SESSIONS ===']
+    yield ['ID', 'Name', 'Status', 'Start Date', 'End Date', 'Location', 'Projects Count']
+    # One grouped COUNT up front instead of one COUNT per session
+    project_counts = dict(
+        db.query(Project.session_id, func.count(Project.id)).group_by(Project.session_id).all()
+    )
+    sessions = db.query(SessionModel).yield_per(EXPORT_BATCH_SIZE)
     for s in sessions:
-        project_count = db.query(Project).filter(Project.session_id == s.id).count()
-        writer.writerow([
+        yield [
             s.id, s.name, s.status,
             s.start_date.strftime('%Y-%m-%d') if s.start_date else '',
             s.end_date.strftime('%Y-%m-%d') if s.end_date else '',
             s.location or '',
-            project_count
-        ])
-    
-    writer.writerow([])
-    writer.writerow(['=== PROJECTS ==='])
-    writer.writerow([
+            project_counts.get(s.id, 0)
+        ]
+
+
+def _export_project_rows(db: Session) -> Iterator[list]:
+    yield []
+    yield ['=== PROJECTS ===']
+    yield [
         'ID', 'Title', 'Session', 'Student', 'Status', 'Tags',
         'Reviewers Assigned', 'Reviews Completed', 'Avg Score'
-    ])
-    projects = db.query(Project).all()
+    ]
+    projects = db.query(Project).options(
+        *_PROJECT_REPORT_OPTIONS, joinedload(Project.session)
+    ).yield_per(EXPORT_BATCH_SIZE)
     for p in projects:
-        reviews = [r for r in p.reviews if r.is_completed]
-        avg_score = sum(r.total_score for r in reviews if r.total_score) / len(reviews) if reviews else 0
-        writer.writerow([
+        yield [
             p.id, p.title,
             p.session.name if p.session else 'No session',
             p.student.full_name,
             p.status,
             ', '.join([t.name for t in p.tags]),
             len(p.assigned_reviewers),
-            len(reviews),
-            round(avg_score, 2)
-        ])
-    
-    writer.writerow([])
-    writer.writerow(['=== REVIEWERS ==='])
-    writer.writerow(['ID', 'Name', 'Email', 'Role', 'Affiliation', 'Approved', 'Projects Assigned', 'Reviews Completed'])
+            p.completed_reviews_count,
+            round(p.avg_score or 0, 2)
+        ]
+
+
+def _export_reviewer_rows(db: Session) -> Iterator[list]:
+    yield []
+    yield ['=== REVIEWERS ===']
+    yield ['ID', 'Name', 'Email', 'Role', 'Affiliation', 'Approved', 'Projects Assigned', 'Reviews Completed']
+    # Per-reviewer tallies come from two grouped COUNTs rather than a COUNT and an
+    # assigned_projects load per reviewer
+    assigned_counts = dict(
+        db.query(project_reviewers.c.user_id, func.count())
+        .group_by(project_reviewers.c.user_id)
+        .all()
+    )
+    completed_counts = dict(
+        db.query(Review.reviewer_id, func.count(Review.id))
+        .filter(Review.is_completed == True)  # noqa: E712
+        .group_by(Review.reviewer_id)
+        .all()
+    )
     reviewers = db.query(User).filter(
         User.role.in_([UserRole.INTERNAL_REVIEWER.value, UserRole.EXTERNAL_REVIEWER.value])
-    ).all()
+    ).yield_per(EXPORT_BATCH_SIZE)
     for r in reviewers:
-        completed_reviews = db.query(Review).filter(
-            Review.reviewer_id == r.id,
-            Review.is_completed == True  # noqa: E712
-        ).count()
-        writer.writerow([
+        yield [
             r.id, r.full_name, r.email, r.role,
             r.affiliation or '', 'Yes' if r.is_approved else 'No',
-            len(r.assigned_projects), completed_reviews
-        ])
-    
-    output.seek(0)
-    
+            assigned_counts.get(r.id, 0), completed_counts.get(r.id, 0)
+        ]
+
+
+@router.get("/export/all")
+async def export_all_data(
+    current_user: TokenData = Depends(require_admin_download),
+    db: Session = Depends(get_db)
+):
+    """Export comprehensive report of all data"""
     filename = f"confeval_full_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     
+    rows = chain(_export_session_rows(db), _export_project_rows(db), _export_reviewer_rows(db))
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _stream_csv(rows),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
@@ -10,6 +10,7 @@ from app.schemas import (
     ReviewCreate, ReviewUpdate, ReviewResponse, NotificationCreate
 )
 from app.auth import get_current_user, require_reviewer, require_admin
+from app.admin_views import invalidate_admin_views
 from app.routers.notifications import create_notification
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
@@ -200,6 +201,7 @@ async def create_review(
         review.total_score = (total_weighted_score / total_weight) * 100
     
     db.commit()
+    invalidate_admin_views()
     db.refresh(review)
     
     # Send notification to student
@@ -290,6 +292,7 @@ async def update_review(
         setattr(review, key, value)
     
     db.commit()
+    invalidate_admin_views()
     db.refresh(review)
     
     return review
@@ -311,5 +314,6 @@ async def delete_review(
     
     db.delete(review)
     db.commit()
+    invalidate_admin_views()
     
     return None
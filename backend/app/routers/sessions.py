@@ -13,6 +13,7 @@ from app.schemas import (
     UpcomingActivity, UpcomingConferenceRef,
 )
 from app.auth import get_current_user, require_admin
+from app.admin_views import invalidate_admin_views
 
 router = APIRouter(prefix="/sessions", tags=["Sessions"])
 
@@ -374,6 +375,7 @@ async def update_session(
                 setattr(session, key, value)
     
     db.commit()
+    invalidate_admin_views()
     db.refresh(session)
     
     return session
@@ -395,6 +397,7 @@ async def delete_session(
     
     db.delete(session)
     db.commit()
+    invalidate_admin_views()
     
     return None
 
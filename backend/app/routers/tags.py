@@ -6,6 +6,7 @@ from app.database import get_db
 from app.models import Tag
 from app.schemas import TagCreate, TagResponse
 from app.auth import require_admin
+from app.admin_views import invalidate_admin_views
 
 router = APIRouter(prefix="/tags", tags=["Tags"])
 
@@ -85,6 +86,7 @@ async def update_tag(
     tag.description = tag_data.description
     
     db.commit()
+    invalidate_admin_views()
     db.refresh(tag)
     
     return tag
@@ -106,5 +108,6 @@ async def delete_tag(
     
     db.delete(tag)
     db.commit()
+    invalidate_admin_views()
     
     return None
@@ -464,6 +464,107 @@ class UpcomingActivity(BaseModel):
     link: str
 
 
+# Report Schemas (admin reports dashboard)
+class OverviewUserCounts(BaseModel):
+    total: int
+    students: int
+    internal_reviewers: int
+    external_reviewers: int
+    admins: int
+    pending_approval: int
+
+
+class OverviewSessionCounts(BaseModel):
+    total: int
+    active: int
+    upcoming: int
+    completed: int
+
+
+class OverviewProjectCounts(BaseModel):
+    total: int
+    pending: int
+    approved: int
+    rejected: int
+
+
+class OverviewReviewCounts(BaseModel):
+    total: int
+    completed: int
+    pending: int
+    average_score: float
+
+
+class AdminOverview(BaseModel):
+    users: OverviewUserCounts
+    sessions: OverviewSessionCounts
+    projects: OverviewProjectCounts
+    reviews: OverviewReviewCounts
+
+
+class SessionReportInfo(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    status: str
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    location: Optional[str] = None
+    max_projects: Optional[int] = None
+    tags: List[str]
+
+
+class SessionReportStatistics(BaseModel):
+    total_projects: int
+    approved_projects: int
+    pending_projects: int
+    rejected_projects: int
+    total_reviewers: int
+    total_reviews: int
+    completed_reviews: int
+
+
+class SessionReportReviewerRef(BaseModel):
+    id: int
+    name: str
+    email: str
+
+
+class SessionReportReviewSummary(BaseModel):
+    total: int
+    completed: int
+    average_score: float
+
+
+class SessionReportProject(BaseModel):
+    id: int
+    title: str
+    student_name: str
+    student_email: str
+    status: str
+    tags: List[str]
+    assigned_reviewers: List[SessionReportReviewerRef]
+    reviews: SessionReportReviewSummary
+    created_at: Optional[datetime] = None
+
+
+class SessionReportReviewer(BaseModel):
+    id: int
+    name: str
+    email: str
+    role: str
+    assigned_projects: int
+    completed_reviews: int
+    pending_reviews: int
+
+
+class SessionDetailsReport(BaseModel):
+    session: SessionReportInfo
+    statistics: SessionReportStatistics
+    projects: List[SessionReportProject]
+    reviewers: List[SessionReportReviewer]
+
+
 # Update forward references
 UserWithTags.model_rebuild()
 SessionWithDetails.model_rebuild()
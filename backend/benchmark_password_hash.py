@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Benchmark Argon2id time costs and recommend an ARGON2_TIME_COST value.
+
+Run on the deployment hardware:
+    python benchmark_password_hash.py [--target-ms 250]
+
+Times hashing at the configured ARGON2_MEMORY_COST / ARGON2_PARALLELISM for
+each time cost and recommends the highest one whose hash time stays at or
+below the target. Set the result as ARGON2_TIME_COST in the .env file.
+"""
+
+import argparse
+import time
+
+from argon2 import PasswordHasher
+
+from app.config import settings
+
+MIN_TIME_COST = 1
+MAX_TIME_COST = 12
+
+
+def time_hash(time_cost: int, samples: int) -> float:
+    """Return the mean time in milliseconds to hash a password at `time_cost`."""
+    hasher = PasswordHasher(
+        time_cost=time_cost,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    )
+    start = time.perf_counter()
+    for _ in range(samples):
+        hasher.hash("test")
+    return (time.perf_counter() - start) * 1000 / samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target hash time in milliseconds")
+    parser.add_argument("--samples", type=int, default=3, help="Hashes timed per time cost")
+    args = parser.parse_args()
+
+    print(f"memory_cost={settings.ARGON2_MEMORY_COST} KiB, parallelism={settings.ARGON2_PARALLELISM}")
+    recommended = MIN_TIME_COST
+    for time_cost in range(MIN_TIME_COST, MAX_TIME_COST + 1):
+        elapsed = time_hash(time_cost, args.samples)
+        print(f"  time_cost={time_cost:2d}  {elapsed:8.1f} ms")
+        if elapsed > args.target_ms:
+            break
+        recommended = time_cost
+
+    print(f"\nConfigured ARGON2_TIME_COST: {settings.ARGON2_TIME_COST}")
+    print(f"Recommended ARGON2_TIME_COST for {args.target_ms:.0f} ms target: {recommended}")
+
+
+if __name__ == "__main__":
+    main()
@@ -58,8 +58,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create upload directory
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+# Create upload directories once so upload handlers don't touch the filesystem per request
+UPLOAD_SUBDIRS = ("cvs", "papers", "slides", "docs")
+for subdir in UPLOAD_SUBDIRS:
+    os.makedirs(os.path.join(settings.UPLOAD_DIR, subdir), exist_ok=True)
 
 # Mount static files for uploads
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
@@ -9,10 +9,16 @@ transaction so a failure on one step does not abort the others (PostgreSQL
 aborts the whole transaction on the first error, unlike SQLite).
 """
 
+import re
+
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.database import engine
+from app.models import (
+    UserRole, ConferenceStatus, SessionStatus, ProjectStatus,
+    ApplicationStatus, TeamInvitationStatus,
+)
 
 
 def run(sql: str, success_msg: str, *, skip_msg: str | None = None) -> None:
@@ -44,6 +50,21 @@ def column_exists(table: str, column: str) -> bool:
         return result.first() is not None
 
 
+def column_type_and_default(table: str, column: str) -> tuple[str, str | None] | None:
+    """Return (data_type, column_default) for a column, or None if it does not exist."""
+    with engine.connect() as conn:
+        row = conn.execute(
+            text(
+                """
+                SELECT data_type, column_default FROM information_schema.columns
+                WHERE table_name = :t AND column_name = :c
+                """
+            ),
+            {"t": table, "c": column},
+        ).first()
+        return None if row is None else (row[0], row[1])
+
+
 print(f"Migrating database: {engine.url.render_as_string(hide_password=True)}")
 
 # --- users: add new columns --------------------------------------------------
@@ -182,4 +203,119 @@ run(
     skip_msg="sessions.conference_id column already exists",
 )
 
+# --- projects: completed-review tallies read by the reports -----------------
+project_stat_columns = [
+    ("completed_reviews_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("avg_score", "DOUBLE PRECISION"),
+]
+added_stat_columns = False
+for col_name, col_type in project_stat_columns:
+    if column_exists("projects", col_name):
+        print(f"  projects.{col_name} column already exists")
+        continue
+    run(
+        f"ALTER TABLE projects ADD COLUMN IF NOT EXISTS {col_name} {col_type}",
+        f"Added projects.{col_name} column",
+        skip_msg=f"projects.{col_name} column already exists",
+    )
+    added_stat_columns = True
+# Backfill from existing reviews only when the columns are new; the Review mapper
+# events keep them current afterwards, so later runs leave the rows alone
+if added_stat_columns:
+    run(
+        """
+        UPDATE projects SET
+            completed_reviews_count = (
+                SELECT COUNT(*) FROM reviews
+                WHERE reviews.project_id = projects.id AND reviews.is_completed
+            ),
+            avg_score = (
+                SELECT AVG(COALESCE(reviews.total_score, 0)) FROM reviews
+                WHERE reviews.project_id = projects.id AND reviews.is_completed
+            )
+        """,
+        "Backfilled projects.completed_reviews_count / avg_score",
+    )
+
+# --- reviewer_applications: one application per (reviewer, session) --------
+run(
+    "ALTER TABLE reviewer_applications ADD CONSTRAINT uq_reviewer_session "
+    "UNIQUE (reviewer_id, session_id)",
+    "Added reviewer_applications (reviewer_id, session_id) unique constraint",
+    skip_msg="reviewer_applications unique constraint already exists",
+)
+
+# --- role/status columns: VARCHAR -> native enum types -----------------------
+enum_columns = [
+    ("users", "role", UserRole),
+    ("conferences", "status", ConferenceStatus),
+    ("sessions", "status", SessionStatus),
+    ("projects", "status", ProjectStatus),
+    ("reviewer_applications", "status", ApplicationStatus),
+    ("project_team_invitations", "status", TeamInvitationStatus),
+]
+for table, col_name, enum_cls in enum_columns:
+    type_name = enum_cls.__name__.lower()
+    labels = ", ".join(f"'{member.value}'" for member in enum_cls)
+    run(
+        f"CREATE TYPE {type_name} AS ENUM ({labels})",
+        f"Created {type_name} enum type",
+        skip_msg=f"{type_name} enum type already exists",
+    )
+    info = column_type_and_default(table, col_name)
+    if info is None:
+        print(f"  {table}.{col_name} column does not exist")
+        continue
+    if info[0] != "character varying":
+        print(f"  {table}.{col_name} already converted")
+        continue
+    # A VARCHAR default cannot be cast to the enum automatically: drop it, convert the
+    # column and put the same literal back as an enum default, all in one statement
+    subcommands = [
+        f"ALTER COLUMN {col_name} DROP DEFAULT",
+        f"ALTER COLUMN {col_name} TYPE {type_name} USING {col_name}::text::{type_name}",
+    ]
+    default_literal = re.match(r"'(?:[^']|'')*'", info[1] or "")
+    if default_literal:
+        subcommands.append(f"ALTER COLUMN {col_name} SET DEFAULT {default_literal.group()}::{type_name}")
+    run(
+        f"ALTER TABLE {table} " + ", ".join(subcommands),
+        f"Converted {table}.{col_name} to {type_name}",
+    )
+
+# --- indexes on hot lookup columns -------------------------------------------
+# email, google_id and site_settings.key are already indexed by their UNIQUE constraints
+indexes = [
+    ("ix_users_role_approved_active", "users", "role, is_approved, is_active"),
+    ("ix_conferences_status", "conferences", "status"),
+    ("ix_sessions_conference_id", "sessions", "conference_id"),
+    ("ix_projects_status_session", "projects", "status, session_id"),
+    ("ix_projects_student_id", "projects", "student_id"),
+    ("ix_projects_created_at", "projects", "created_at"),
+    ("ix_reviews_project_completed", "reviews", "project_id, is_completed"),
+    ("ix_project_team_invitations_email_status", "project_team_invitations", "email, status"),
+]
+for index_name, table, columns in indexes:
+    run(
+        f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})",
+        f"Created index {index_name}",
+    )
+# Superseded by ix_users_role_approved_active, which shares its leading columns
+run("DROP INDEX IF EXISTS ix_users_role_approved", "Dropped index ix_users_role_approved")
+
+# Partial index over the completed, scored reviews that the avg_score/review_count
+# aggregates read
+run(
+    "CREATE INDEX IF NOT EXISTS ix_reviews_completed_scored ON reviews (project_id) "
+    "INCLUDE (total_score) WHERE is_completed AND total_score IS NOT NULL",
+    "Created index ix_reviews_completed_scored",
+)
+
+# INCLUDE (id) lets the reorder ID-check aggregate run as an index-only scan
+run(
+    'CREATE INDEX IF NOT EXISTS ix_criteria_session_order ON criteria (session_id, "order") '
+    "INCLUDE (id)",
+    "Created index ix_criteria_session_order",
+)
+
 print("\nMigration complete!")
@@ -12,6 +12,7 @@ from sqlalchemy.pool import StaticPool
 
 # Override DATABASE_URL before importing app modules
 os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-local-test-runs")
 
 from app.database import Base, get_db
 from app.models import (
@@ -19,7 +20,9 @@ from app.models import (
     Criteria,
     ConferenceStatus, SessionStatus, ProjectStatus,
 )
-from app.auth import get_password_hash, create_access_token
+from app.auth import _admin_cache, _user_role_cache, get_password_hash, create_access_token
+from app.routers.auth import _settings_cache
+from app.admin_views import _admin_view_cache
 from main import app
 
 # In-memory SQLite for tests
@@ -41,6 +44,10 @@ def db():
     finally:
         session.close()
         Base.metadata.drop_all(bind=TEST_ENGINE)
+        _settings_cache.clear()
+        _admin_cache.clear()
+        _user_role_cache.clear()
+        _admin_view_cache.clear()
 
 
 @pytest.fixture()
@@ -0,0 +1,108 @@
+"""Integration tests for /api/applications endpoints."""
+
+from tests.conftest import make_admin, make_reviewer, make_session, auth_header
+from app.models import Notification, session_reviewers
+
+
+class TestCreateApplication:
+    def test_reviewer_applies_and_admins_notified(self, client, db):
+        admin = make_admin(db)
+        other_admin = make_admin(db, email="admin2@test.com")
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        resp = client.post(
+            "/api/applications",
+            headers=auth_header(reviewer),
+            json={"session_id": sess.id, "message": "Pick me"},
+        )
+        assert resp.status_code == 201
+        assert resp.json()["status"] == "pending"
+        notified = {n.user_id for n in db.query(Notification).all()}
+        assert notified == {admin.id, other_admin.id}
+
+    def test_duplicate_application_rejected(self, client, db):
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        payload = {"session_id": sess.id}
+        client.post("/api/applications", headers=auth_header(reviewer), json=payload)
+        resp = client.post("/api/applications", headers=auth_header(reviewer), json=payload)
+        assert resp.status_code == 400
+        assert "already applied" in resp.json()["detail"]
+
+    def test_already_assigned_reviewer_rejected(self, client, db):
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        sess.reviewers.append(reviewer)
+        db.commit()
+        resp = client.post(
+            "/api/applications",
+            headers=auth_header(reviewer),
+            json={"session_id": sess.id},
+        )
+        assert resp.status_code == 400
+        assert "already assigned" in resp.json()["detail"]
+
+    def test_unknown_session(self, client, db):
+        reviewer = make_reviewer(db)
+        resp = client.post(
+            "/api/applications",
+            headers=auth_header(reviewer),
+            json={"session_id": 9999},
+        )
+        assert resp.status_code == 404
+
+
+class TestUpdateApplicationStatus:
+    def test_approval_assigns_reviewer(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        app_id = client.post(
+            "/api/applications",
+            headers=auth_header(reviewer),
+            json={"session_id": sess.id},
+        ).json()["id"]
+        resp = client.put(
+            f"/api/applications/{app_id}/status",
+            headers=auth_header(admin),
+            json={"status": "approved"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "approved"
+        db.refresh(sess)
+        assert reviewer in sess.reviewers
+
+    def test_reapproval_does_not_duplicate_assignment(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        app_id = client.post(
+            "/api/applications",
+            headers=auth_header(reviewer),
+            json={"session_id": sess.id},
+        ).json()["id"]
+        for _ in range(2):
+            client.put(
+                f"/api/applications/{app_id}/status",
+                headers=auth_header(admin),
+                json={"status": "approved"},
+            )
+        rows = db.query(session_reviewers).filter(
+            session_reviewers.c.session_id == sess.id
+        ).all()
+        assert len(rows) == 1
+
+
+class TestListApplications:
+    def test_reviewer_sees_only_own(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        other = make_reviewer(db, email="other@test.com")
+        sess = make_session(db)
+        for r in (reviewer, other):
+            client.post("/api/applications", headers=auth_header(r), json={"session_id": sess.id})
+        resp = client.get("/api/applications", headers=auth_header(reviewer))
+        assert resp.status_code == 200
+        assert [a["reviewer_id"] for a in resp.json()] == [reviewer.id]
+        resp = client.get("/api/applications", headers=auth_header(admin))
+        assert len(resp.json()) == 2
@@ -1,6 +1,10 @@
 """Integration tests for /api/auth endpoints."""
 
-from tests.conftest import make_user, make_reviewer, auth_header
+import bcrypt
+import pytest
+from tests.conftest import make_user, make_admin, make_reviewer, make_token, auth_header
+from app.config import settings
+from app.models import Notification, User
 
 
 class TestRegister:
@@ -59,6 +63,21 @@ class TestRegister:
         assert resp.status_code == 201
         assert resp.json()["is_approved"] is False
 
+    def test_register_reviewer_notifies_admins(self, client, db):
+        admins = [make_admin(db, email=f"admin{i}@test.com") for i in range(2)]
+        resp = client.post(
+            "/api/auth/register",
+            data={
+                "email": "rev2@test.com",
+                "password": "Valid1pass",
+                "full_name": "Reviewer",
+                "role": "internal_reviewer",
+            },
+        )
+        assert resp.status_code == 201
+        notified = {n.user_id for n in db.query(Notification).all()}
+        assert notified == {a.id for a in admins}
+
     def test_register_invalid_id_number(self, client, db):
         resp = client.post(
             "/api/auth/register",
@@ -83,6 +102,18 @@ class TestLogin:
         assert resp.status_code == 200
         assert "access_token" in resp.json()
 
+    def test_login_upgrades_legacy_bcrypt_hash(self, client, db):
+        user = make_user(db, email="legacy@test.com")
+        user.hashed_password = bcrypt.hashpw(b"Valid1pass", bcrypt.gensalt(rounds=4))
+        db.commit()
+        resp = client.post(
+            "/api/auth/login",
+            json={"email": "legacy@test.com", "password": "Valid1pass"},
+        )
+        assert resp.status_code == 200
+        db.refresh(user)
+        assert user.hashed_password.startswith(b"$argon2id$")
+
     def test_login_wrong_password(self, client, db):
         make_user(db, email="wp@test.com", password="Valid1pass")
         resp = client.post(
@@ -147,3 +178,161 @@ class TestUpdateMe:
         )
         assert resp.status_code == 200
         assert resp.json()["full_name"] == "Updated Name"
+
+
+class TestGoogleAuth:
+    def test_new_google_user_has_no_password(self, client, db, monkeypatch):
+        from google.oauth2 import id_token
+
+        monkeypatch.setattr(
+            id_token,
+            "verify_oauth2_token",
+            lambda *a, **kw: {"sub": "g-123", "email": "g@test.com", "name": "G User"},
+        )
+        resp = client.post("/api/auth/google", json={"token": "fake"})
+        assert resp.status_code == 200
+        assert "access_token" in resp.json()
+        user = db.query(User).filter(User.email == "g@test.com").one()
+        assert user.google_id == "g-123"
+        assert user.hashed_password is None
+
+        resp = client.post(
+            "/api/auth/login",
+            json={"email": "g@test.com", "password": "Anything1"},
+        )
+        assert resp.status_code == 401
+
+
+class TestUploadCV:
+    @pytest.fixture(autouse=True)
+    def upload_dir(self, tmp_path, monkeypatch):
+        # main.py creates the subdirectories at startup
+        (tmp_path / "cvs").mkdir()
+        monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+
+    def test_upload_cv(self, client, db):
+        reviewer = make_reviewer(db)
+        resp = client.post(
+            "/api/auth/me/cv",
+            headers=auth_header(reviewer),
+            files={"file": ("cv.pdf", b"%PDF-1.4 test", "application/pdf")},
+        )
+        assert resp.status_code == 200
+        cv_path = resp.json()["cv_path"]
+        assert cv_path.endswith(".pdf")
+        with open(cv_path, "rb") as f:
+            assert f.read() == b"%PDF-1.4 test"
+
+    def test_cv_names_are_random(self, client, db, tmp_path):
+        paths = []
+        for i in range(2):
+            reviewer = make_reviewer(db, email=f"dup{i}@test.com")
+            resp = client.post(
+                "/api/auth/me/cv",
+                headers=auth_header(reviewer),
+                files={"file": ("cv.pdf", b"%PDF-1.4 same", "application/pdf")},
+            )
+            paths.append(resp.json()["cv_path"])
+        # Identical content must not map to one shared, content-derived public URL
+        assert paths[0] != paths[1]
+        assert len(list((tmp_path / "cvs").iterdir())) == 2
+
+    def test_admin_downloads_cv(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        client.post(
+            "/api/auth/me/cv",
+            headers=auth_header(reviewer),
+            files={"file": ("cv.pdf", b"%PDF-1.4 test", "application/pdf")},
+        )
+        resp = client.get(
+            f"/api/auth/users/{reviewer.id}/cv", params={"token": make_token(admin)}
+        )
+        assert resp.status_code == 200
+        assert resp.content == b"%PDF-1.4 test"
+        assert resp.headers["content-length"] == str(len(b"%PDF-1.4 test"))
+
+    def test_download_cv_requires_admin_token(self, client, db):
+        reviewer = make_reviewer(db)
+        resp = client.get(f"/api/auth/users/{reviewer.id}/cv")
+        assert resp.status_code == 401
+        resp = client.get(
+            f"/api/auth/users/{reviewer.id}/cv", params={"token": make_token(reviewer)}
+        )
+        assert resp.status_code == 403
+        resp = client.get(f"/api/auth/users/{reviewer.id}/cv", params={"token": "bad"})
+        assert resp.status_code == 401
+
+    def test_oversize_cv_rejected(self, client, db, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_FILE_SIZE", 10)
+        reviewer = make_reviewer(db)
+        resp = client.post(
+            "/api/auth/me/cv",
+            headers=auth_header(reviewer),
+            files={"file": ("cv.pdf", b"x" * 64, "application/pdf")},
+        )
+        assert resp.status_code == 400
+        assert list((tmp_path / "cvs").iterdir()) == []
+
+    def test_wrong_extension_rejected(self, client, db):
+        reviewer = make_reviewer(db)
+        resp = client.post(
+            "/api/auth/me/cv",
+            headers=auth_header(reviewer),
+            files={"file": ("cv.exe", b"MZ", "application/octet-stream")},
+        )
+        assert resp.status_code == 400
+
+
+class TestSiteSettings:
+    def test_update_invalidates_cached_value(self, client, db):
+        admin = make_admin(db)
+        resp = client.get("/api/auth/settings/internal_reviewer_affiliation")
+        assert resp.json()["value"] is None
+
+        resp = client.put(
+            "/api/auth/settings/internal_reviewer_affiliation",
+            headers=auth_header(admin),
+            json={"value": "Test University"},
+        )
+        assert resp.status_code == 200
+        resp = client.get("/api/auth/settings/internal_reviewer_affiliation")
+        assert resp.json()["value"] == "Test University"
+
+        resp = client.post(
+            "/api/auth/register",
+            data={
+                "email": "internal@test.com",
+                "password": "Valid1pass",
+                "full_name": "Internal",
+                "role": "internal_reviewer",
+            },
+        )
+        assert resp.status_code == 201
+        assert resp.json()["affiliation"] == "Test University"
+
+
+class TestUserAdmin:
+    def test_list_users(self, client, db):
+        admin = make_admin(db)
+        make_reviewer(db, email="r@test.com")
+        resp = client.get("/api/auth/users", headers=auth_header(admin))
+        assert resp.status_code == 200
+        emails = {u["email"] for u in resp.json()}
+        assert emails == {admin.email, "r@test.com"}
+
+    def test_pending_count(self, client, db):
+        admin = make_admin(db)
+        make_reviewer(db, email="p1@test.com", is_approved=False)
+        make_reviewer(db, email="p2@test.com", is_approved=True)
+        resp = client.get("/api/auth/users/pending-count", headers=auth_header(admin))
+        assert resp.json() == {"pending_count": 1}
+
+
+class TestDeleteUser:
+    def test_admin_deletes_other_admin(self, client, db):
+        admin = make_admin(db)
+        other = make_admin(db, email="admin2@test.com")
+        resp = client.delete(f"/api/auth/users/{other.id}", headers=auth_header(admin))
+        assert resp.status_code == 200
+        assert db.get(User, other.id) is None
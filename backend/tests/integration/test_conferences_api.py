@@ -1,7 +1,7 @@
 """Integration tests for /api/conferences endpoints."""
 
 from datetime import datetime, timedelta
-from tests.conftest import make_admin, make_user, make_conference, auth_header
+from tests.conftest import make_admin, make_user, make_conference, make_session, auth_header
 from app.models import ConferenceStatus
 
 
@@ -60,3 +60,78 @@ class TestDeleteConference:
             f"/api/conferences/{conf.id}", headers=auth_header(admin)
         )
         assert resp.status_code in (200, 204)
+
+    def test_cannot_delete_conference_with_sessions(self, client, db):
+        admin = make_admin(db)
+        conf = make_conference(db)
+        make_session(db, conference=conf)
+        resp = client.delete(
+            f"/api/conferences/{conf.id}", headers=auth_header(admin)
+        )
+        assert resp.status_code == 400
+
+
+class TestUpdateConference:
+    def test_max_sessions_below_current_count_rejected(self, client, db):
+        admin = make_admin(db)
+        conf = make_conference(db)
+        make_session(db, conference=conf)
+        make_session(db, conference=conf, name="Second")
+        resp = client.put(
+            f"/api/conferences/{conf.id}",
+            headers=auth_header(admin),
+            json={"max_sessions": 1},
+        )
+        assert resp.status_code == 400
+
+    def test_get_conference_session_count(self, client, db):
+        admin = make_admin(db)
+        conf = make_conference(db)
+        make_session(db, conference=conf)
+        resp = client.get(
+            f"/api/conferences/{conf.id}", headers=auth_header(admin)
+        )
+        assert resp.status_code == 200
+        assert resp.json()["session_count"] == 1
+
+
+class TestConferenceSessions:
+    def test_lists_sessions_of_conference(self, client, db):
+        admin = make_admin(db)
+        conf = make_conference(db)
+        make_session(db, conference=conf, name="Mine")
+        make_session(db, name="Other")
+        resp = client.get(
+            f"/api/conferences/{conf.id}/sessions", headers=auth_header(admin)
+        )
+        assert resp.status_code == 200
+        assert [s["name"] for s in resp.json()] == ["Mine"]
+
+    def test_add_session_to_conference(self, client, db):
+        admin = make_admin(db)
+        conf = make_conference(db, end_date=datetime.utcnow() + timedelta(days=3))
+        sess = make_session(db, conference=None)
+        resp = client.post(
+            f"/api/conferences/{conf.id}/sessions/{sess.id}", headers=auth_header(admin)
+        )
+        assert resp.status_code == 200
+        db.refresh(sess)
+        assert sess.conference_id == conf.id
+
+    def test_add_session_rejected_when_conference_full(self, client, db):
+        admin = make_admin(db)
+        conf = make_conference(db, max_sessions=1, end_date=datetime.utcnow() + timedelta(days=3))
+        make_session(
+            db,
+            conference=conf,
+            start_date=datetime.utcnow() + timedelta(days=2),
+            end_date=datetime.utcnow() + timedelta(days=2, hours=1),
+        )
+        sess = make_session(db)
+        resp = client.post(
+            f"/api/conferences/{conf.id}/sessions/{sess.id}", headers=auth_header(admin)
+        )
+        assert resp.status_code == 400
+        assert "maximum number of sessions" in resp.json()["detail"]
+        db.refresh(sess)
+        assert sess.conference_id != conf.id
@@ -0,0 +1,260 @@
+"""Integration tests for /api/criteria endpoints."""
+
+from sqlalchemy import event
+
+from tests.conftest import TEST_ENGINE, make_admin, make_user, make_session, make_criteria, auth_header
+
+
+class TestListCriteria:
+    def test_lists_criteria_in_order(self, client, db):
+        user = make_user(db)
+        sess = make_session(db)
+        make_criteria(db, sess, name="Second", order=1)
+        make_criteria(db, sess, name="First", order=0)
+        resp = client.get(f"/api/criteria/session/{sess.id}", headers=auth_header(user))
+        assert resp.status_code == 200
+        assert [c["name"] for c in resp.json()] == ["First", "Second"]
+
+    def test_lists_only_requested_session(self, client, db):
+        user = make_user(db)
+        first, second = make_session(db), make_session(db)
+        make_criteria(db, first, name="In first")
+        make_criteria(db, second, name="In second")
+        for sess, name in ((first, "In first"), (second, "In second")):
+            resp = client.get(f"/api/criteria/session/{sess.id}", headers=auth_header(user))
+            assert [c["name"] for c in resp.json()] == [name]
+
+    def test_lists_without_per_row_queries(self, client, db):
+        user = make_user(db)
+        sess = make_session(db)
+        for i in range(3):
+            make_criteria(db, sess, name=f"C{i}", order=i)
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", count)
+        try:
+            resp = client.get(f"/api/criteria/session/{sess.id}", headers=auth_header(user))
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", count)
+        assert resp.status_code == 200
+        # The ETag is derived from the fetched rows; one query, none per criterion
+        assert len([s for s in statements if "FROM criteria" in s]) == 1
+
+    def test_etag_revalidation(self, client, db):
+        user = make_user(db)
+        sess = make_session(db)
+        make_criteria(db, sess, name="A")
+        url = f"/api/criteria/session/{sess.id}"
+        resp = client.get(url, headers=auth_header(user))
+        etag = resp.headers["etag"]
+        resp = client.get(url, headers={**auth_header(user), "If-None-Match": etag})
+        assert resp.status_code == 304
+
+        make_criteria(db, sess, name="B", order=1)
+        resp = client.get(url, headers={**auth_header(user), "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert len(resp.json()) == 2
+
+    def test_etag_changes_on_rename(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        crit = make_criteria(db, sess, name="Old")
+        url = f"/api/criteria/session/{sess.id}"
+        etag = client.get(url, headers=auth_header(admin)).headers["etag"]
+
+        resp = client.put(f"/api/criteria/{crit.id}", headers=auth_header(admin), json={"name": "New"})
+        assert resp.status_code == 200
+        resp = client.get(url, headers={**auth_header(admin), "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert [c["name"] for c in resp.json()] == ["New"]
+
+    def test_etag_changes_on_reorder(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        first = make_criteria(db, sess, name="A", order=0)
+        second = make_criteria(db, sess, name="B", order=1)
+        url = f"/api/criteria/session/{sess.id}"
+        etag = client.get(url, headers=auth_header(admin)).headers["etag"]
+
+        resp = client.put(
+            f"/api/criteria/session/{sess.id}/reorder",
+            headers=auth_header(admin),
+            json=[second.id, first.id],
+        )
+        assert resp.status_code == 200
+        resp = client.get(url, headers={**auth_header(admin), "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert [c["name"] for c in resp.json()] == ["B", "A"]
+
+    def test_session_without_criteria(self, client, db):
+        user = make_user(db)
+        sess = make_session(db)
+        resp = client.get(f"/api/criteria/session/{sess.id}", headers=auth_header(user))
+        assert resp.status_code == 200
+        assert resp.json() == []
+
+    def test_unknown_session(self, client, db):
+        user = make_user(db)
+        resp = client.get("/api/criteria/session/9999", headers=auth_header(user))
+        assert resp.status_code == 404
+
+
+class TestCreateCriteria:
+    def test_admin_creates_criteria(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        resp = client.post(
+            "/api/criteria",
+            headers=auth_header(admin),
+            json={"session_id": sess.id, "name": "Clarity"},
+        )
+        assert resp.status_code == 201
+        assert resp.json()["name"] == "Clarity"
+
+    def test_new_criteria_appended_after_last(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        make_criteria(db, sess, name="A", order=0)
+        make_criteria(db, sess, name="B", order=4)
+        resp = client.post(
+            "/api/criteria",
+            headers=auth_header(admin),
+            json={"session_id": sess.id, "name": "C"},
+        )
+        assert resp.json()["order"] == 5
+
+    def test_explicit_order_is_kept(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        make_criteria(db, sess, name="A", order=0)
+        resp = client.post(
+            "/api/criteria",
+            headers=auth_header(admin),
+            json={"session_id": sess.id, "name": "C", "order": 0},
+        )
+        assert resp.json()["order"] == 0
+
+    def test_unknown_session(self, client, db):
+        admin = make_admin(db)
+        resp = client.post(
+            "/api/criteria",
+            headers=auth_header(admin),
+            json={"session_id": 9999, "name": "Clarity"},
+        )
+        assert resp.status_code == 404
+
+    def test_student_cannot_create_criteria(self, client, db):
+        student = make_user(db)
+        sess = make_session(db)
+        resp = client.post(
+            "/api/criteria",
+            headers=auth_header(student),
+            json={"session_id": sess.id, "name": "Clarity"},
+        )
+        assert resp.status_code == 403
+
+    def test_demoted_admin_loses_access(self, client, db):
+        admin = make_admin(db)
+        other = make_admin(db, email="admin2@test.com")
+        sess = make_session(db)
+        payload = {"session_id": sess.id, "name": "Clarity"}
+        resp = client.post("/api/criteria", headers=auth_header(other), json=payload)
+        assert resp.status_code == 201
+
+        resp = client.put(
+            f"/api/auth/users/{other.id}/role",
+            headers=auth_header(admin),
+            params={"role": "student"},
+        )
+        assert resp.status_code == 200
+        resp = client.post("/api/criteria", headers=auth_header(other), json=payload)
+        assert resp.status_code == 403
+
+
+class TestReorderCriteria:
+    def test_reorder(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        a = make_criteria(db, sess, name="A", order=0)
+        b = make_criteria(db, sess, name="B", order=1)
+        resp = client.put(
+            f"/api/criteria/session/{sess.id}/reorder",
+            headers=auth_header(admin),
+            json=[b.id, a.id],
+        )
+        assert resp.status_code == 200
+        resp = client.get(f"/api/criteria/session/{sess.id}", headers=auth_header(admin))
+        assert [c["name"] for c in resp.json()] == ["B", "A"]
+
+    def test_reorder_rejects_mismatched_ids(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        a = make_criteria(db, sess, name="A", order=0)
+        make_criteria(db, sess, name="B", order=1)
+        resp = client.put(
+            f"/api/criteria/session/{sess.id}/reorder",
+            headers=auth_header(admin),
+            json=[a.id],
+        )
+        assert resp.status_code == 400
+
+    def test_reorder_rejects_foreign_ids(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        a = make_criteria(db, sess, name="A", order=0)
+        other = make_criteria(db, make_session(db), name="Other")
+        resp = client.put(
+            f"/api/criteria/session/{sess.id}/reorder",
+            headers=auth_header(admin),
+            json=[a.id, other.id],
+        )
+        assert resp.status_code == 400
+
+    def test_reorder_rejects_duplicate_ids(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        a = make_criteria(db, sess, name="A", order=0)
+        make_criteria(db, sess, name="B", order=1)
+        resp = client.put(
+            f"/api/criteria/session/{sess.id}/reorder",
+            headers=auth_header(admin),
+            json=[a.id, a.id],
+        )
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Duplicate criteria IDs"
+
+    def test_reorder_empty_session(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        resp = client.put(
+            f"/api/criteria/session/{sess.id}/reorder",
+            headers=auth_header(admin),
+            json=[],
+        )
+        assert resp.status_code == 200
+
+
+class TestCriteriaById:
+    def test_get_update_delete(self, client, db):
+        admin = make_admin(db)
+        crit = make_criteria(db, make_session(db))
+        resp = client.get(f"/api/criteria/{crit.id}", headers=auth_header(admin))
+        assert resp.status_code == 200
+        resp = client.put(
+            f"/api/criteria/{crit.id}", headers=auth_header(admin), json={"weight": 2.0}
+        )
+        assert resp.json()["weight"] == 2.0
+        resp = client.put(f"/api/criteria/{crit.id}", headers=auth_header(admin), json={})
+        assert resp.json()["weight"] == 2.0
+        resp = client.put("/api/criteria/9999", headers=auth_header(admin), json={"weight": 2.0})
+        assert resp.status_code == 404
+        resp = client.delete(f"/api/criteria/{crit.id}", headers=auth_header(admin))
+        assert resp.status_code == 204
+        resp = client.get(f"/api/criteria/{crit.id}", headers=auth_header(admin))
+        assert resp.status_code == 404
@@ -1,8 +1,18 @@
 """Integration tests for /api/projects endpoints."""
 
+import os
+
+import pytest
+from sqlalchemy import event
+
+from app import admin_views
+from app.config import settings
+from app.models import (
+    Notification, ProjectStatus, ProjectTeamInvitation, Review, TeamInvitationStatus,
+)
 from tests.conftest import (
-    make_user, make_admin, make_reviewer, make_session,
-    make_project, auth_header,
+    TEST_ENGINE, make_user, make_admin, make_reviewer, make_session,
+    make_project, make_tag, make_token, auth_header,
 )
 
 
@@ -15,6 +25,39 @@ class TestListProjects:
         assert resp.status_code == 200
         assert len(resp.json()) >= 1
 
+    def test_limit_is_bounded(self, client, db):
+        admin = make_admin(db)
+        resp = client.get("/api/projects", headers=auth_header(admin), params={"limit": 100000})
+        assert resp.status_code == 422
+        resp = client.get("/api/projects", headers=auth_header(admin), params={"limit": 500})
+        assert resp.status_code == 200
+
+    def test_query_count_does_not_grow_with_projects(self, client, db):
+        admin = make_admin(db)
+        tag = make_tag(db)
+        sess = make_session(db)
+
+        def list_statement_count():
+            statements = []
+
+            def count(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(TEST_ENGINE, "before_cursor_execute", count)
+            try:
+                resp = client.get("/api/projects", headers=auth_header(admin))
+            finally:
+                event.remove(TEST_ENGINE, "before_cursor_execute", count)
+            assert resp.status_code == 200
+            return len(statements)
+
+        for i in range(2):
+            make_project(db, student=make_user(db, email=f"a{i}@test.com"), session=sess, tags=[tag])
+        few = list_statement_count()
+        for i in range(4):
+            make_project(db, student=make_user(db, email=f"b{i}@test.com"), session=sess, tags=[tag])
+        assert list_statement_count() == few
+
     def test_student_sees_own_projects(self, client, db):
         student = make_user(db)
         make_project(db, student=student)
@@ -24,6 +67,74 @@ class TestListProjects:
         assert len(projects) >= 1
         assert all(p["student_id"] == student.id for p in projects)
 
+    def test_my_projects_review_stats(self, client, db):
+        student = make_user(db)
+        reviewer = make_reviewer(db)
+        scored = make_project(db, student=student, title="Scored")
+        make_project(db, student=student, title="Unreviewed")
+        db.add_all([
+            Review(project_id=scored.id, reviewer_id=reviewer.id, total_score=80, is_completed=True),
+            Review(project_id=scored.id, reviewer_id=reviewer.id, total_score=90, is_completed=True),
+            Review(project_id=scored.id, reviewer_id=reviewer.id, total_score=10, is_completed=False),
+            Review(project_id=scored.id, reviewer_id=reviewer.id, total_score=None, is_completed=True),
+        ])
+        db.commit()
+        resp = client.get("/api/projects/my", headers=auth_header(student))
+        stats = {p["title"]: (p["avg_score"], p["review_count"]) for p in resp.json()}
+        assert stats == {"Scored": (85.0, 2), "Unreviewed": (None, 0)}
+
+
+class TestPendingCount:
+    def test_cached_until_a_project_write(self, client, db):
+        admin = make_admin(db)
+        student = make_user(db)
+        make_project(db, student=student)
+        resp = client.get("/api/projects/pending-count", headers=auth_header(admin))
+        assert resp.json() == {"pending_count": 1}
+
+        # Written behind the router's back: the cached count is still served
+        make_project(db, student=student)
+        resp = client.get("/api/projects/pending-count", headers=auth_header(admin))
+        assert resp.json() == {"pending_count": 1}
+
+        resp = client.post(
+            "/api/projects", headers=auth_header(student), json={"title": "Third"}
+        )
+        assert resp.status_code == 201
+        resp = client.get("/api/projects/pending-count", headers=auth_header(admin))
+        assert resp.json() == {"pending_count": 3}
+
+    def test_read_racing_a_write_is_not_cached(self, client, db):
+        admin = make_admin(db)
+        make_project(db, student=make_user(db))
+
+        def concurrent_write(conn, cursor, statement, *args):
+            # A write commits and invalidates while the count query is in flight
+            admin_views.invalidate_admin_views()
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", concurrent_write)
+        try:
+            resp = client.get("/api/projects/pending-count", headers=auth_header(admin))
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", concurrent_write)
+        assert resp.json() == {"pending_count": 1}
+        assert len(admin_views._admin_view_cache) == 0
+
+    def test_reviewer_approval_refreshes_assignment_view(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db, is_approved=False)
+        resp = client.get("/api/projects/assignments/reviewers", headers=auth_header(admin))
+        assert resp.json() == []
+
+        resp = client.put(
+            f"/api/auth/users/{reviewer.id}/approve",
+            headers=auth_header(admin),
+            params={"is_approved": True},
+        )
+        assert resp.status_code == 200
+        resp = client.get("/api/projects/assignments/reviewers", headers=auth_header(admin))
+        assert [r["id"] for r in resp.json()] == [reviewer.id]
+
 
 class TestCreateProject:
     def test_student_creates_project(self, client, db):
@@ -41,6 +152,21 @@ class TestCreateProject:
         assert resp.status_code == 201
         assert resp.json()["title"] == "My Research"
 
+    def test_notifies_team_members_and_admins(self, client, db):
+        admins = [make_admin(db, email=f"admin{i}@test.com") for i in range(2)]
+        student = make_user(db)
+        member = make_user(db, email="member@test.com")
+        resp = client.post(
+            "/api/projects",
+            headers=auth_header(student),
+            json={"title": "Team Research", "team_member_emails": ["member@test.com"]},
+        )
+        assert resp.status_code == 201
+        notified = {(n.user_id, n.title) for n in db.query(Notification).all()}
+        assert notified == {(member.id, "Added to Project Team")} | {
+            (a.id, "New Project Submission") for a in admins
+        }
+
     def test_reviewer_cannot_create_project(self, client, db):
         rev = make_reviewer(db)
         resp = client.post(
@@ -83,7 +209,459 @@ class TestGetProject:
         resp = client.get(f"/api/projects/{proj.id}", headers=auth_header(admin))
         assert resp.status_code == 200
 
+    def test_team_member_can_view_project(self, client, db):
+        owner = make_user(db)
+        member = make_user(db, email="member@test.com")
+        outsider = make_user(db, email="outsider@test.com")
+        proj = make_project(db, student=owner, team_members=[member])
+        resp = client.get(f"/api/projects/{proj.id}", headers=auth_header(member))
+        assert resp.status_code == 200
+        assert [m["id"] for m in resp.json()["team_members"]] == [member.id]
+        resp = client.get(f"/api/projects/{proj.id}", headers=auth_header(outsider))
+        assert resp.status_code == 403
+
     def test_get_nonexistent_project(self, client, db):
         admin = make_admin(db)
         resp = client.get("/api/projects/9999", headers=auth_header(admin))
         assert resp.status_code == 404
+
+
+class TestAssignmentProjects:
+    def test_lists_approved_projects_with_review_counts(self, client, db):
+        admin = make_admin(db)
+        tag = make_tag(db)
+        sess = make_session(db)
+        reviewer = make_reviewer(db)
+        reviewer.interested_tags.append(tag)
+        member = make_user(db, email="member@test.com")
+        proj = make_project(
+            db,
+            session=sess,
+            status=ProjectStatus.APPROVED.value,
+            assigned_reviewers=[reviewer],
+            team_members=[member],
+            tags=[tag],
+        )
+        make_project(db, student=make_user(db, email="p@test.com"))
+        db.add_all([
+            Review(project_id=proj.id, reviewer_id=reviewer.id, is_completed=True),
+            Review(project_id=proj.id, reviewer_id=reviewer.id, is_completed=False),
+        ])
+        db.commit()
+        resp = client.get("/api/projects/assignments/projects", headers=auth_header(admin))
+        assert resp.status_code == 200
+        [body] = resp.json()
+        assert body["id"] == proj.id
+        assert body["reviews_count"] == 1
+        assert body["session_name"] == sess.name
+        assert body["student_email"] == "user@test.com"
+        assert body["tags"] == [{"id": tag.id, "name": tag.name}]
+        assert [m["id"] for m in body["team_members"]] == [member.id]
+        assert body["assigned_reviewers"] == [{
+            "id": reviewer.id,
+            "full_name": reviewer.full_name,
+            "email": reviewer.email,
+            "tag_ids": [tag.id],
+            "touched_session_ids": [sess.id],
+        }]
+
+
+class TestAutoAssign:
+    def test_supervisor_then_best_tag_match(self, client, db):
+        admin = make_admin(db)
+        tag = make_tag(db)
+        sess = make_session(db)
+        make_session(db, name="Other Session")
+        supervisor = make_reviewer(db, email="sup@test.com")
+        make_reviewer(db, email="plain@test.com")
+        matching = make_reviewer(db, email="match@test.com")
+        matching.interested_tags.append(tag)
+        db.commit()
+        proj = make_project(
+            db,
+            session=sess,
+            status=ProjectStatus.APPROVED.value,
+            supervisor1_email="sup@test.com",
+            tags=[tag],
+        )
+        resp = client.post("/api/projects/assignments/auto-assign", headers=auth_header(admin))
+        assert resp.status_code == 200
+        picks = [(a["reviewer_id"], a["role"]) for a in resp.json()["proposed_assignments"]]
+        assert picks == [(supervisor.id, "supervisor"), (matching.id, "reviewer")]
+        db.refresh(proj)
+        assert {r.id for r in proj.assigned_reviewers} == {supervisor.id, matching.id}
+
+    def test_preview_keeps_existing_and_writes_nothing(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        make_session(db, name="Other Session")
+        supervisor = make_reviewer(db, email="sup@test.com")
+        other = make_reviewer(db, email="other@test.com")
+        proj = make_project(
+            db,
+            session=sess,
+            status=ProjectStatus.APPROVED.value,
+            supervisor1_email="sup@test.com",
+            assigned_reviewers=[supervisor],
+        )
+        resp = client.post(
+            "/api/projects/assignments/auto-assign",
+            headers=auth_header(admin),
+            params={"preview": True},
+        )
+        assert resp.status_code == 200
+        picks = [(a["reviewer_id"], a["role"]) for a in resp.json()["proposed_assignments"]]
+        assert picks == [(other.id, "reviewer")]
+        db.refresh(proj)
+        assert [r.id for r in proj.assigned_reviewers] == [supervisor.id]
+
+
+class TestAssignmentReviewers:
+    def test_counts_assignments_per_session(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        other = make_session(db, name="Other Session")
+        make_project(db, session=sess, assigned_reviewers=[reviewer])
+        make_project(db, student=make_user(db, email="b@test.com"), session=other, assigned_reviewers=[reviewer])
+        make_project(db, student=make_user(db, email="c@test.com"), assigned_reviewers=[reviewer])
+        resp = client.get(
+            "/api/projects/assignments/reviewers",
+            headers=auth_header(admin),
+            params={"session_id": sess.id},
+        )
+        assert resp.status_code == 200
+        [body] = resp.json()
+        assert body["assigned_projects_count"] == 1
+        assert body["total_assigned_projects"] == 3
+        assert body["tags"] == []
+
+
+class TestUploadPaper:
+    @pytest.fixture(autouse=True)
+    def upload_dir(self, tmp_path, monkeypatch):
+        # main.py creates the subdirectories at startup
+        (tmp_path / "papers").mkdir()
+        monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+
+    def test_upload_paper(self, client, db):
+        student = make_user(db)
+        proj = make_project(db, student=student)
+        resp = client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 paper", "application/pdf")},
+        )
+        assert resp.status_code == 200
+        with open(resp.json()["paper_path"], "rb") as f:
+            assert f.read() == b"%PDF-1.4 paper"
+
+    def test_download_via_accel_redirect(self, client, db, monkeypatch):
+        student = make_user(db)
+        proj = make_project(db, student=student, title="My Paper")
+        client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 paper", "application/pdf")},
+        )
+        monkeypatch.setattr(settings, "ACCEL_REDIRECT_PREFIX", "/internal/uploads/")
+        resp = client.get(
+            f"/api/projects/{proj.id}/paper/download", params={"token": make_token(student)}
+        )
+        assert resp.status_code == 200
+        assert resp.content == b""
+        assert resp.headers["x-accel-redirect"].startswith("/internal/uploads/papers/")
+        assert resp.headers["content-disposition"] == 'attachment; filename="My_Paper_paper.pdf"'
+
+    def test_download_spanning_several_chunks(self, client, db, monkeypatch):
+        from app.routers import projects as projects_router
+
+        monkeypatch.setattr(projects_router._DownloadFileResponse, "chunk_size", 4)
+        student = make_user(db)
+        proj = make_project(db, student=student)
+        client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 paper", "application/pdf")},
+        )
+        resp = client.get(
+            f"/api/projects/{proj.id}/paper/download", params={"token": make_token(student)}
+        )
+        assert resp.content == b"%PDF-1.4 paper"
+        assert resp.headers["content-length"] == str(len(b"%PDF-1.4 paper"))
+
+    def test_download_revalidation(self, client, db):
+        student = make_user(db)
+        proj = make_project(db, student=student)
+        client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 paper", "application/pdf")},
+        )
+        url = f"/api/projects/{proj.id}/paper/download"
+        params = {"token": make_token(student)}
+        resp = client.get(url, params=params)
+        etag = resp.headers["etag"]
+        assert resp.headers["cache-control"] == "private, max-age=300"
+
+        resp = client.get(url, params=params, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+        client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 revised", "application/pdf")},
+        )
+        resp = client.get(url, params=params, headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.content == b"%PDF-1.4 revised"
+        assert resp.headers["etag"] != etag
+
+    def test_repeat_download_is_one_query(self, client, db):
+        student = make_user(db)
+        proj = make_project(db, student=student)
+        client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 paper", "application/pdf")},
+        )
+        url = f"/api/projects/{proj.id}/paper/download"
+        token = make_token(student)
+        assert client.get(url, params={"token": token}).status_code == 200
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", count)
+        try:
+            resp = client.get(url, params={"token": token})
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", count)
+        assert resp.status_code == 200
+        assert len(statements) == 1
+
+    @pytest.mark.parametrize("kind, detail", [
+        ("paper", "Paper not found"),
+        ("slides", "Slides not found"),
+        ("docs", "Additional documents not found"),
+    ])
+    def test_download_without_upload(self, client, db, kind, detail):
+        student = make_user(db)
+        proj = make_project(db, student=student)
+        resp = client.get(
+            f"/api/projects/{proj.id}/{kind}/download", params={"token": make_token(student)}
+        )
+        assert resp.status_code == 404
+        assert resp.json()["detail"] == detail
+
+    def test_delete_paper_removes_file(self, client, db):
+        student = make_user(db)
+        proj = make_project(db, student=student)
+        resp = client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 paper", "application/pdf")},
+        )
+        stored = resp.json()["paper_path"]
+        resp = client.delete(f"/api/projects/{proj.id}/paper", headers=auth_header(student))
+        assert resp.status_code == 200
+        assert resp.json()["paper_path"] is None
+        assert not os.path.exists(stored)
+        resp = client.get(
+            f"/api/projects/{proj.id}/paper/download", params={"token": make_token(student)}
+        )
+        assert resp.status_code == 404
+
+    def test_connection_released_during_file_write(self, client, db, monkeypatch):
+        from app.routers import projects as projects_router
+
+        student = make_user(db)
+        proj = make_project(db, student=student)
+        write_upload = projects_router._write_upload
+        in_transaction = []
+
+        def spy(src, file_path):
+            in_transaction.append(db.in_transaction())
+            write_upload(src, file_path)
+
+        monkeypatch.setattr(projects_router, "_write_upload", spy)
+        resp = client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 paper", "application/pdf")},
+        )
+        assert resp.status_code == 200
+        assert in_transaction == [False]
+
+    def test_oversize_paper_rejected(self, client, db, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_FILE_SIZE", 10)
+        student = make_user(db)
+        proj = make_project(db, student=student)
+        resp = client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"x" * 64, "application/pdf")},
+        )
+        assert resp.status_code == 400
+        assert list((tmp_path / "papers").iterdir()) == []
+
+    def test_download_paper_with_token_param(self, client, db):
+        admin = make_admin(db)
+        student = make_user(db)
+        other = make_user(db, email="other@test.com")
+        proj = make_project(db, student=student)
+        client.post(
+            f"/api/projects/{proj.id}/paper",
+            headers=auth_header(student),
+            files={"file": ("paper.pdf", b"%PDF-1.4 paper", "application/pdf")},
+        )
+        url = f"/api/projects/{proj.id}/paper/download"
+        resp = client.get(url, params={"token": make_token(student)})
+        assert resp.status_code == 200
+        assert resp.content == b"%PDF-1.4 paper"
+        assert client.get(url, params={"token": make_token(other)}).status_code == 403
+        assert client.get(url, params={"token": "bad"}).status_code == 401
+
+        resp = client.put(
+            f"/api/auth/users/{student.id}/status",
+            headers=auth_header(admin),
+            params={"is_active": False},
+        )
+        assert resp.status_code == 200
+        assert client.get(url, params={"token": make_token(student)}).status_code == 403
+
+
+class TestReviewerAssignment:
+    def test_assign_and_unassign(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        proj = make_project(db, session=make_session(db))
+        url = f"/api/projects/{proj.id}/reviewers/{reviewer.id}"
+        assert client.post(url, headers=auth_header(admin)).status_code == 200
+        resp = client.post(url, headers=auth_header(admin))
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Reviewer already assigned to this project"
+        resp = client.get(f"/api/projects/{proj.id}/reviewers", headers=auth_header(admin))
+        assert [r["id"] for r in resp.json()] == [reviewer.id]
+
+        assert client.delete(url, headers=auth_header(admin)).status_code == 200
+        resp = client.delete(url, headers=auth_header(admin))
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Reviewer is not assigned to this project"
+
+    def test_session_limit(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        projects = [make_project(db, session=sess, student=make_user(db, email=f"s{i}@test.com")) for i in range(5)]
+        for proj in projects[:4]:
+            proj.assigned_reviewers.append(reviewer)
+        # Assignments in other sessions do not count towards the limit
+        elsewhere = make_project(db, session=make_session(db), student=projects[0].student)
+        elsewhere.assigned_reviewers.append(reviewer)
+        db.commit()
+        resp = client.post(
+            f"/api/projects/{projects[4].id}/reviewers/{reviewer.id}", headers=auth_header(admin)
+        )
+        assert resp.status_code == 400
+        assert "maximum of 4" in resp.json()["detail"]
+
+        projects[0].assigned_reviewers.remove(reviewer)
+        db.commit()
+        resp = client.post(
+            f"/api/projects/{projects[4].id}/reviewers/{reviewer.id}", headers=auth_header(admin)
+        )
+        assert resp.status_code == 200
+
+    def test_unknown_project_or_reviewer(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        proj = make_project(db)
+        assert client.post(f"/api/projects/9999/reviewers/{reviewer.id}", headers=auth_header(admin)).status_code == 404
+        assert client.post(f"/api/projects/{proj.id}/reviewers/9999", headers=auth_header(admin)).status_code == 404
+        assert client.delete(f"/api/projects/{proj.id}/reviewers/9999", headers=auth_header(admin)).status_code == 404
+
+
+class TestTeamMembers:
+    def test_add_and_remove(self, client, db):
+        admin = make_admin(db)
+        owner = make_user(db)
+        member = make_user(db, email="member@test.com")
+        proj = make_project(db, student=owner)
+        url = f"/api/projects/{proj.id}/team-members/{member.id}"
+        assert client.post(url, headers=auth_header(admin)).status_code == 200
+        resp = client.post(url, headers=auth_header(admin))
+        assert resp.json()["detail"] == "Student is already a team member"
+        resp = client.get(f"/api/projects/{proj.id}/team-members", headers=auth_header(owner))
+        assert [m["id"] for m in resp.json()] == [member.id]
+
+        assert client.delete(url, headers=auth_header(admin)).status_code == 200
+        resp = client.delete(url, headers=auth_header(admin))
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Student is not a team member of this project"
+
+    def test_owner_cannot_be_added(self, client, db):
+        admin = make_admin(db)
+        owner = make_user(db)
+        proj = make_project(db, student=owner)
+        resp = client.post(f"/api/projects/{proj.id}/team-members/{owner.id}", headers=auth_header(admin))
+        assert resp.status_code == 400
+
+
+class TestClearAssignments:
+    def test_clears_only_requested_session(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        other = make_session(db, name="Other Session")
+        cleared = make_project(db, session=sess, assigned_reviewers=[reviewer])
+        kept = make_project(
+            db, student=make_user(db, email="b@test.com"), session=other, assigned_reviewers=[reviewer]
+        )
+        resp = client.delete(
+            "/api/projects/assignments/clear",
+            headers=auth_header(admin),
+            params={"session_id": sess.id},
+        )
+        assert resp.json() == {"message": "Cleared 1 assignments"}
+        db.refresh(cleared)
+        db.refresh(kept)
+        assert cleared.assigned_reviewers == []
+        assert [r.id for r in kept.assigned_reviewers] == [reviewer.id]
+
+
+class TestTeamInvitations:
+    def make_invitation(self, db, email="invitee@test.com"):
+        owner = make_user(db, email="owner@test.com")
+        proj = make_project(db, student=owner)
+        invitation = ProjectTeamInvitation(project_id=proj.id, email=email, invited_by_id=owner.id)
+        db.add(invitation)
+        db.commit()
+        return proj, invitation
+
+    def test_accept_adds_team_member(self, client, db):
+        proj, invitation = self.make_invitation(db)
+        invitee = make_user(db, email="invitee@test.com")
+        url = f"/api/projects/invitations/{invitation.id}/accept"
+        resp = client.post(url, headers=auth_header(invitee))
+        assert resp.json() == {"message": "Invitation accepted", "project_id": proj.id}
+        db.refresh(proj)
+        db.refresh(invitation)
+        assert [m.id for m in proj.team_members] == [invitee.id]
+        assert invitation.status == TeamInvitationStatus.ACCEPTED
+        assert invitation.responded_at is not None
+        assert client.post(url, headers=auth_header(invitee)).status_code == 404
+
+    def test_decline_and_foreign_invitation(self, client, db):
+        proj, invitation = self.make_invitation(db)
+        stranger = make_user(db, email="stranger@test.com")
+        url = f"/api/projects/invitations/{invitation.id}/decline"
+        assert client.post(url, headers=auth_header(stranger)).status_code == 404
+        invitee = make_user(db, email="invitee@test.com")
+        assert client.post(url, headers=auth_header(invitee)).status_code == 200
+        db.refresh(invitation)
+        db.refresh(proj)
+        assert invitation.status == TeamInvitationStatus.DECLINED
+        assert proj.team_members == []
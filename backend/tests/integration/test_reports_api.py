@@ -0,0 +1,206 @@
+"""Integration tests for /api/reports endpoints."""
+
+from sqlalchemy import event
+
+from app.models import Review
+from tests.conftest import (
+    TEST_ENGINE, make_admin, make_user, make_reviewer, make_session, make_project,
+    make_tag, make_token, auth_header,
+)
+
+
+class TestAdminOverview:
+    def test_overview_counts(self, client, db):
+        admin = make_admin(db)
+        reviewer = make_reviewer(db, is_approved=False)
+        sess = make_session(db)
+        proj = make_project(db, session=sess)
+        db.add_all([
+            Review(project_id=proj.id, reviewer_id=reviewer.id, total_score=80, is_completed=True),
+            Review(project_id=proj.id, reviewer_id=reviewer.id, total_score=None, is_completed=True),
+            Review(project_id=proj.id, reviewer_id=reviewer.id, total_score=10, is_completed=False),
+        ])
+        db.commit()
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", count)
+        try:
+            resp = client.get("/api/reports/overview", headers=auth_header(admin))
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", count)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["users"] == {
+            "total": 3, "students": 1, "internal_reviewers": 1, "external_reviewers": 0,
+            "admins": 1, "pending_approval": 1,
+        }
+        assert body["sessions"] == {"total": 1, "active": 0, "upcoming": 1, "completed": 0}
+        assert body["projects"] == {"total": 1, "pending": 1, "approved": 0, "rejected": 0}
+        assert body["reviews"] == {"total": 3, "completed": 2, "pending": 1, "average_score": 80}
+        # One aggregate per table
+        assert len([s for s in statements if "count(" in s.lower()]) == 4
+
+
+class TestSessionDetails:
+    def test_details_without_per_project_queries(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        first = make_reviewer(db)
+        second = make_reviewer(db, email="reviewer2@test.com")
+        tag = make_tag(db)
+        for i in range(3):
+            proj = make_project(
+                db, student=make_user(db, email=f"s{i}@test.com"), session=sess, title=f"P{i}"
+            )
+            proj.tags.append(tag)
+            proj.assigned_reviewers.extend([first, second])
+            db.add(Review(project_id=proj.id, reviewer_id=first.id, total_score=60 + i, is_completed=True))
+            db.add(Review(project_id=proj.id, reviewer_id=second.id, is_completed=False))
+        db.commit()
+        db.expire_all()
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", count)
+        try:
+            resp = client.get(f"/api/reports/sessions/{sess.id}/details", headers=auth_header(admin))
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", count)
+        assert resp.status_code == 200
+        # Auth, session + tags, projects + student, and one per eager-loaded collection
+        assert len(statements) <= 8
+
+        body = resp.json()
+        assert body["statistics"]["total_reviews"] == 6
+        assert body["statistics"]["completed_reviews"] == 3
+        assert body["statistics"]["total_reviewers"] == 2
+        assert body["projects"][0]["tags"] == [tag.name]
+        assert body["projects"][0]["reviews"] == {"total": 2, "completed": 1, "average_score": 60}
+        stats = {r["id"]: r for r in body["reviewers"]}
+        assert stats[first.id]["completed_reviews"] == 3
+        assert stats[first.id]["pending_reviews"] == 0
+        assert stats[second.id]["assigned_projects"] == 3
+        assert stats[second.id]["pending_reviews"] == 3
+
+    def test_unknown_session(self, client, db):
+        admin = make_admin(db)
+        resp = client.get("/api/reports/sessions/9999/details", headers=auth_header(admin))
+        assert resp.status_code == 404
+
+
+class TestExportSessionReport:
+    def test_admin_exports_csv(self, client, db):
+        admin = make_admin(db)
+        sess = make_session(db)
+        make_project(db, session=sess, title="Exported Project")
+        resp = client.get(
+            f"/api/reports/sessions/{sess.id}/export", params={"token": make_token(admin)}
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert "Exported Project" in resp.text
+
+    def test_streams_in_batches(self, client, db, monkeypatch):
+        from app.routers import reports
+
+        monkeypatch.setattr(reports, "CSV_FLUSH_ROWS", 2)
+        admin = make_admin(db)
+        sess = make_session(db)
+        for i in range(5):
+            make_project(db, student=make_user(db, email=f"s{i}@test.com"), session=sess, title=f"P{i}")
+        chunks = list(reports._stream_csv(reports._session_report_rows(db, sess.id)))
+        assert len(chunks) == 3
+        resp = client.get(
+            f"/api/reports/sessions/{sess.id}/export", params={"token": make_token(admin)}
+        )
+        lines = resp.text.splitlines()
+        assert len(lines) == 6
+        assert [line.split(",")[1] for line in lines[1:]] == [f"P{i}" for i in range(5)]
+
+    def test_unknown_session(self, client, db):
+        admin = make_admin(db)
+        resp = client.get("/api/reports/sessions/9999/export", params={"token": make_token(admin)})
+        assert resp.status_code == 404
+
+    def test_requires_admin_token(self, client, db):
+        student = make_user(db)
+        sess = make_session(db)
+        url = f"/api/reports/sessions/{sess.id}/export"
+        assert client.get(url, params={"token": make_token(student)}).status_code == 403
+        assert client.get(url, params={"token": "bad"}).status_code == 401
+        assert client.get(url).status_code == 422
+
+
+def _count_export_statements(client, url, token):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", count)
+    try:
+        resp = client.get(url, params={"token": token})
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", count)
+    assert resp.status_code == 200
+    return len(statements), resp.text
+
+
+class TestExportAll:
+    def test_project_rows_loaded_in_batches(self, client, db, monkeypatch):
+        from app.routers import reports
+
+        monkeypatch.setattr(reports, "EXPORT_BATCH_SIZE", 2)
+        admin = make_admin(db)
+        reviewer = make_reviewer(db)
+        tag = make_tag(db)
+        sess = make_session(db)
+        counts = []
+        for batch in range(2):
+            for i in range(4):
+                proj = make_project(
+                    db, student=make_user(db, email=f"s{batch}{i}@test.com"), session=sess,
+                    title=f"P{batch}{i}",
+                )
+                proj.tags.append(tag)
+                proj.assigned_reviewers.append(reviewer)
+                db.add(Review(project_id=proj.id, reviewer_id=reviewer.id, total_score=50, is_completed=True))
+            db.commit()
+            db.expire_all()
+            counts.append(_count_export_statements(client, "/api/reports/export/all", make_token(admin)))
+        # Four more projects add two batches of two selectin loads, not queries per project
+        (before, _), (after, text) = counts
+        assert after - before <= 2 * 2
+        assert all(f"P1{i}" in text for i in range(4))
+
+    def test_counts_without_per_row_queries(self, client, db):
+        admin = make_admin(db)
+        sessions = [make_session(db, name=f"S{i}") for i in range(3)]
+        reviewers = [make_reviewer(db, email=f"r{i}@test.com", full_name=f"R{i}") for i in range(3)]
+        for i, sess in enumerate(sessions):
+            proj = make_project(db, student=make_user(db, email=f"s{i}@test.com"), session=sess)
+            proj.assigned_reviewers.extend(reviewers[: i + 1])
+            db.add(Review(project_id=proj.id, reviewer_id=reviewers[0].id, is_completed=True))
+        db.commit()
+        db.expire_all()
+        count, text = _count_export_statements(client, "/api/reports/export/all", make_token(admin))
+        # Auth, three grouped COUNTs, and one query per table plus the project eager loads
+        assert count <= 10
+        rows = {line.split(",")[1]: line.split(",") for line in text.splitlines() if line.count(",") > 5}
+        assert rows["S0"][-1] == "1"
+        assert rows["R0"][-2:] == ["3", "3"]
+        assert rows["R2"][-2:] == ["1", "0"]
+
+    def test_admin_exports_all(self, client, db):
+        admin = make_admin(db)
+        make_project(db, session=make_session(db), title="Exported Project")
+        resp = client.get("/api/reports/export/all", params={"token": make_token(admin)})
+        assert resp.status_code == 200
+        sections = [line for line in resp.text.splitlines() if line.startswith("===")]
+        assert sections == ["=== SESSIONS ===", "=== PROJECTS ===", "=== REVIEWERS ==="]
+        assert "Exported Project" in resp.text
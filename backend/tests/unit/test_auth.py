@@ -1,5 +1,7 @@
 """Unit tests for the auth module (password hashing, JWT tokens, role checks)."""
 
+import time
+import bcrypt
 import pytest
 from datetime import timedelta
 from unittest.mock import MagicMock
@@ -8,11 +10,16 @@ from fastapi import HTTPException
 from app.auth import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    verify_and_update_password,
     create_access_token,
     decode_token,
     require_admin,
     require_reviewer,
     require_student,
+    require_role,
+    _token_cache,
 )
 from app.models import UserRole
 
@@ -35,6 +42,58 @@ class TestPasswordHashing:
         h2 = get_password_hash("same")
         assert h1 != h2  # different salts
 
+    def test_verify_accepts_str_hash(self):
+        hashed = get_password_hash("text-hash")
+        assert verify_password("text-hash", hashed.decode("ascii")) is True
+
+    def test_new_hashes_use_argon2id(self):
+        assert get_password_hash("pw").startswith(b"$argon2id$")
+
+    def test_legacy_bcrypt_hash_verified_and_upgraded(self):
+        legacy = bcrypt.hashpw(b"old-pass", bcrypt.gensalt(rounds=4))
+        ok, new_hash = verify_and_update_password("old-pass", legacy)
+        assert ok is True
+        assert new_hash.startswith(b"$argon2id$")
+        assert verify_and_update_password("old-pass", new_hash) == (True, None)
+
+    def test_legacy_bcrypt_wrong_password(self):
+        legacy = bcrypt.hashpw(b"old-pass", bcrypt.gensalt(rounds=4))
+        assert verify_and_update_password("nope", legacy) == (False, None)
+
+    def test_verify_missing_hash(self):
+        assert verify_password("anything", None) is False
+        assert verify_password("anything", "") is False
+
+    def test_verify_malformed_hash(self):
+        assert verify_password("anything", "not-a-bcrypt-hash") is False
+        assert verify_password("anything", "$1$" + "x" * 57) is False
+
+    def test_successful_check_is_cached(self, monkeypatch):
+        import app.auth as auth_module
+
+        hashed = get_password_hash("cached-pass")
+        assert verify_password("cached-pass", hashed) is True
+        spy = MagicMock(wraps=auth_module._argon2)
+        monkeypatch.setattr(auth_module, "_argon2", spy)
+        assert verify_password("cached-pass", hashed) is True
+        spy.verify.assert_not_called()
+        assert verify_password("wrong-pass", hashed) is False
+        spy.verify.assert_called_once()
+
+    def test_missing_hash_still_runs_a_hash_check(self, monkeypatch):
+        import app.auth as auth_module
+
+        spy = MagicMock(wraps=auth_module._argon2)
+        monkeypatch.setattr(auth_module, "_argon2", spy)
+        assert verify_password("anything", None) is False
+        spy.verify.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_async_hash_and_verify(self):
+        hashed = await get_password_hash_async("pool-pass")
+        assert await verify_password_async("pool-pass", hashed) is True
+        assert await verify_password_async("wrong", hashed) is False
+
 
 # ── JWT tokens ────────────────────────────────────────────────────
 
@@ -67,6 +126,23 @@ class TestJWT:
         token = create_access_token({"role": "admin"})
         assert decode_token(token) is None
 
+    def test_decode_result_is_cached(self):
+        token = create_access_token({"sub": 7, "role": "student"})
+        first = decode_token(token)
+        assert decode_token(token) is first
+
+    def test_cached_token_expires(self, monkeypatch):
+        token = create_access_token(
+            {"sub": 8, "role": "student"},
+            expires_delta=timedelta(seconds=5),
+        )
+        assert _token_cache.get(token) is None
+        assert decode_token(token) is not None
+        assert _token_cache.get(token) is not None
+        real_time = time.time
+        monkeypatch.setattr(time, "time", lambda: real_time() + 3600)
+        assert _token_cache.get(token) is None
+
 
 # ── Role guards (sync wrappers) ──────────────────────────────────
 
@@ -127,3 +203,25 @@ class TestRequireStudent:
         with pytest.raises(HTTPException) as exc:
             require_student(current_user=user)
         assert exc.value.status_code == 403
+
+
+class TestRequireRole:
+    @pytest.mark.asyncio
+    async def test_allowed_role_passes(self):
+        checker = require_role(UserRole.ADMIN, UserRole.INTERNAL_REVIEWER)
+        user = _mock_user(UserRole.INTERNAL_REVIEWER.value)
+        assert await checker(current_user=user) is user
+
+    @pytest.mark.asyncio
+    async def test_other_role_rejected(self):
+        checker = require_role(UserRole.ADMIN)
+        user = _mock_user(UserRole.STUDENT.value)
+        with pytest.raises(HTTPException) as exc:
+            await checker(current_user=user)
+        assert exc.value.status_code == 403
+
+    def test_same_roles_share_one_dependency(self):
+        a = require_role(UserRole.ADMIN, UserRole.INTERNAL_REVIEWER)
+        b = require_role(UserRole.INTERNAL_REVIEWER, UserRole.ADMIN)
+        assert a is b
+        assert require_role(UserRole.ADMIN) is not a
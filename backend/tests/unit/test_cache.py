@@ -0,0 +1,40 @@
+"""Unit tests for the in-process TTL cache."""
+
+import time
+
+from app.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_get_and_set(self):
+        cache = TTLCache()
+        cache.set("a", 1, time.time() + 60)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_expired_entry_is_evicted(self):
+        cache = TTLCache()
+        cache.set("a", 1, time.time() - 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_maxsize_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2)
+        deadline = time.time() + 60
+        cache.set("a", 1, deadline)
+        cache.set("b", 2, deadline)
+        cache.get("a")
+        cache.set("c", 3, deadline)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop_and_clear(self):
+        cache = TTLCache()
+        deadline = time.time() + 60
+        cache.set("a", 1, deadline)
+        cache.set("b", 2, deadline)
+        assert cache.pop("a") == 1
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
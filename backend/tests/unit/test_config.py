@@ -0,0 +1,26 @@
+"""Unit tests for settings helpers."""
+
+import pytest
+
+from app.config import _load_or_create_secret_key
+
+
+class TestSecretKeyFile:
+    def test_generated_once_and_reused(self, tmp_path):
+        path = str(tmp_path / ".secret_key")
+        first = _load_or_create_secret_key(path)
+        assert first
+        assert _load_or_create_secret_key(path) == first
+        assert list(tmp_path.iterdir()) == [tmp_path / ".secret_key"]
+
+    def test_existing_key_is_used(self, tmp_path):
+        path = tmp_path / ".secret_key"
+        path.write_text("persisted-key\n")
+        assert _load_or_create_secret_key(str(path)) == "persisted-key"
+
+    def test_empty_key_file_is_rejected(self, tmp_path):
+        path = tmp_path / ".secret_key"
+        path.write_text("")
+        with pytest.raises(RuntimeError):
+            _load_or_create_secret_key(str(path))
+        assert list(tmp_path.iterdir()) == [path]
@@ -5,8 +5,9 @@ from tests.conftest import (
     make_user, make_admin, make_reviewer, make_tag,
     make_conference, make_session, make_project, make_criteria,
 )
+from sqlalchemy.exc import IntegrityError
 from app.models import (
-    UserRole, Review, CriteriaScore,
+    UserRole, Review, CriteriaScore, ReviewerApplication,
     ConferenceStatus, SessionStatus, ProjectStatus,
     NotificationType,
 )
@@ -27,6 +28,18 @@ class TestUserModel:
         rev = make_reviewer(db)
         assert rev.role == UserRole.INTERNAL_REVIEWER.value
 
+    def test_role_loaded_as_plain_string(self, db):
+        user = make_user(db)
+        db.expire(user)
+        assert type(user.role) is str
+        assert user.role == UserRole.STUDENT.value
+
+    def test_hashed_password_loaded_as_bytes(self, db):
+        user = make_user(db)
+        db.expire(user)
+        assert isinstance(user.hashed_password, bytes)
+        assert user.hashed_password.startswith(b"$argon2id$")
+
     def test_email_unique(self, db):
         make_user(db, email="dupe@test.com")
         with pytest.raises(Exception):  # IntegrityError
@@ -111,6 +124,47 @@ class TestReviewModel:
         assert len(review.criteria_scores) == 1
 
 
+    def test_project_review_stats_follow_review_writes(self, db):
+        first = make_reviewer(db)
+        second = make_reviewer(db, email="reviewer2@test.com")
+        proj = make_project(db, session=make_session(db))
+        assert (proj.completed_reviews_count, proj.avg_score) == (0, None)
+
+        done = Review(project_id=proj.id, reviewer_id=first.id, total_score=80.0, is_completed=True)
+        draft = Review(project_id=proj.id, reviewer_id=second.id, total_score=40.0)
+        db.add_all([done, draft])
+        db.commit()
+        assert (proj.completed_reviews_count, proj.avg_score) == (1, 80.0)
+
+        draft.is_completed = True
+        db.commit()
+        assert (proj.completed_reviews_count, proj.avg_score) == (2, 60.0)
+
+        done.total_score = None
+        db.commit()
+        assert (proj.completed_reviews_count, proj.avg_score) == (2, 20.0)
+
+        db.delete(draft)
+        db.commit()
+        assert (proj.completed_reviews_count, proj.avg_score) == (1, 0.0)
+
+        db.delete(done)
+        db.commit()
+        assert (proj.completed_reviews_count, proj.avg_score) == (0, None)
+
+
+class TestReviewerApplicationModel:
+    def test_one_application_per_reviewer_and_session(self, db):
+        reviewer = make_reviewer(db)
+        sess = make_session(db)
+        db.add(ReviewerApplication(reviewer_id=reviewer.id, session_id=sess.id))
+        db.commit()
+        db.add(ReviewerApplication(reviewer_id=reviewer.id, session_id=sess.id))
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
+
+
 class TestEnums:
     def test_user_roles(self):
         assert set(UserRole) == {